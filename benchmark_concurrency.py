@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Concurrency Benchmark for VMF Project
+Starts the site under gunicorn with sync (WSGI) and uvicorn (ASGI) workers,
+holds slow client connections open and measures how normal requests fare
+"""
+
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+MODES = {
+    'wsgi': ('vmf_project.wsgi:application', 'sync'),
+    'asgi': ('vmf_project.asgi:application', 'uvicorn_worker.UvicornWorker'),
+}
+
+
+def start_server(mode, port, workers):
+    """Start gunicorn in the given mode and wait until it answers"""
+    app_module, worker_class = MODES[mode]
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', app_module,
+            '--worker-class', worker_class,
+            '--workers', str(workers),
+            '--bind', f'127.0.0.1:{port}',
+            '--timeout', '120',
+            '--log-level', 'warning',
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=2).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start on port {port}')
+
+
+def open_slow_clients(port, count):
+    """Open connections that send a partial request and then stall"""
+    clients = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET / HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+        clients.append(sock)
+    return clients
+
+
+def timed_request(url, timeout):
+    """Return the request latency in seconds, or None on failure"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+    except OSError:
+        return None
+    return time.perf_counter() - started
+
+
+def run_probe(port, path, requests, concurrency, timeout):
+    """Send requests with the given concurrency and summarise the results"""
+    url = f'http://127.0.0.1:{port}{path}'
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(lambda _: timed_request(url, timeout), range(requests)))
+
+    ok = sorted(latency for latency in latencies if latency is not None)
+    if not ok:
+        return len(ok), None, None
+    p95 = ok[min(len(ok) - 1, int(len(ok) * 0.95))]
+    return len(ok), statistics.median(ok) * 1000, p95 * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI workers under slow clients')
+    parser.add_argument('--path', default='/', help='Page to request')
+    parser.add_argument('--workers', type=int, default=3, help='Gunicorn workers per mode')
+    parser.add_argument('--slow-clients', default='0,3,10,100', help='Comma separated stalled connection counts')
+    parser.add_argument('--requests', type=int, default=200, help='Probe requests per run')
+    parser.add_argument('--concurrency', type=int, default=20, help='Concurrent probe requests')
+    parser.add_argument('--timeout', type=float, default=5.0, help='Probe request timeout in seconds')
+    parser.add_argument('--port', type=int, default=8701, help='First port to bind')
+    args = parser.parse_args()
+
+    slow_counts = [int(count) for count in args.slow_clients.split(',')]
+
+    print("⏱️  VMF Concurrency Benchmark")
+    print("=" * 50)
+    print(f"{args.requests} requests to {args.path} at concurrency {args.concurrency}, {args.workers} workers\n")
+    print(f"{'mode':<6}{'slow':>6}{'ok':>8}{'p50 ms':>10}{'p95 ms':>10}")
+
+    for offset, mode in enumerate(MODES):
+        port = args.port + offset
+        process = start_server(mode, port, args.workers)
+        try:
+            for slow in slow_counts:
+                clients = open_slow_clients(port, slow)
+                try:
+                    ok, p50, p95 = run_probe(port, args.path, args.requests, args.concurrency, args.timeout)
+                finally:
+                    for sock in clients:
+                        sock.close()
+                p50 = f'{p50:.1f}' if p50 is not None else '-'
+                p95 = f'{p95:.1f}' if p95 is not None else '-'
+                print(f"{mode:<6}{slow:>6}{f'{ok}/{args.requests}':>8}{p50:>10}{p95:>10}")
+        finally:
+            process.terminate()
+            process.wait()
+
+    print("\n✅ Benchmark complete")
+
+
+if __name__ == '__main__':
+    main()
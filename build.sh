@@ -13,6 +13,11 @@ pip install -r requirements.txt
 echo "Running database migrations..."
 python manage.py migrate
 
+# Build critical CSS and JS bundles (must run before collectstatic)
+echo "Building critical CSS and JS bundles..."
+python manage.py build_critical_css
+python manage.py build_js_bundles
+
 # Collect static files
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
@@ -23,6 +23,11 @@ pip install -r requirements.txt
 echo "🔄 Running database migrations..."
 python manage.py migrate --noinput
 
+# Build critical CSS and JS bundles (must run before collectstatic)
+echo "🎨 Building critical CSS and JS bundles..."
+python manage.py build_critical_css
+python manage.py build_js_bundles
+
 # Collect static files
 echo "📁 Collecting static files..."
 python manage.py collectstatic --noinput
@@ -41,8 +46,29 @@ if not User.objects.filter(is_superuser=True).exists():
 echo "🌐 Starting production server..."
 echo "Admin panel will be available at: https://vishwakarmamechfab.in/$DJANGO_ADMIN_URL"
 
+mkdir -p logs
+
+# Background job worker (image processing for admin uploads)
+echo "🧵 Starting background job worker..."
+# The worker takes over from running jobs inline in the web request
+export VMF_RUN_JOBS_INLINE=${VMF_RUN_JOBS_INLINE:-False}
+python manage.py run_jobs --concurrency 2 >> logs/jobs.log 2>&1 &
+JOB_WORKER_PID=$!
+trap 'kill $JOB_WORKER_PID 2>/dev/null' EXIT
+
 # Use Gunicorn for production
-gunicorn vmf_project.wsgi:application \
+# VMF_SERVER_MODE=asgi runs the async views on uvicorn workers instead of sync workers
+if [ "$VMF_SERVER_MODE" = "asgi" ]; then
+    APP_MODULE="vmf_project.asgi:application"
+    WORKER_CLASS="uvicorn_worker.UvicornWorker"
+else
+    APP_MODULE="vmf_project.wsgi:application"
+    WORKER_CLASS="sync"
+fi
+echo "⚙️  Server mode: ${VMF_SERVER_MODE:-wsgi} ($WORKER_CLASS workers)"
+
+gunicorn $APP_MODULE \
+    --worker-class $WORKER_CLASS \
     --bind 0.0.0.0:8000 \
     --workers 3 \
     --timeout 120 \
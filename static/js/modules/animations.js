@@ -0,0 +1,65 @@
+/* =============== SCROLL ANIMATIONS =============== */
+const observerOptions = {
+    threshold: 0.1,
+    rootMargin: '0px 0px -50px 0px'
+};
+
+const observer = new IntersectionObserver((entries) => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            entry.target.classList.add('animate-in');
+        }
+    });
+}, observerOptions);
+
+// Add animation classes to elements
+document.addEventListener('DOMContentLoaded', () => {
+    // Elements to animate
+    const animateElements = document.querySelectorAll(
+        '.service__card, .project__card, .client__card, .feature, .stat, .hero__content, .hero__logo-container'
+    );
+    
+    animateElements.forEach((el, index) => {
+        // Add initial animation styles
+        el.style.cssText += `
+            opacity: 0;
+            transform: translateY(30px);
+            transition: opacity 0.45s ease-in, transform 0.45s ease-in;
+            transition-delay: ${index * 0.02}s;
+        `;
+        
+        // Observe for intersection
+        observer.observe(el);
+    });
+});
+
+// Add CSS for animation states
+const animationStyles = document.createElement('style');
+animationStyles.textContent = `
+    .animate-in {
+        opacity: 1 !important;
+        transform: translateY(0) !important;
+    }
+`;
+document.head.appendChild(animationStyles);
+
+/* =============== LAZY LOADING SIMULATION =============== */
+// Simulate lazy loading for project images (in a real implementation, you'd use actual images)
+const projectCards = document.querySelectorAll('.project__card');
+
+const imageObserver = new IntersectionObserver((entries) => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            const placeholder = entry.target.querySelector('.project__image-placeholder');
+            if (placeholder) {
+                placeholder.style.background = 'linear-gradient(135deg, #64748b, #94a3b8)';
+                placeholder.style.transition = 'background 0.5s ease';
+            }
+            imageObserver.unobserve(entry.target);
+        }
+    });
+});
+
+projectCards.forEach(card => {
+    imageObserver.observe(card);
+});
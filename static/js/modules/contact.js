@@ -0,0 +1,97 @@
+/* =============== CONTACT FORM =============== */
+const contactForm = document.getElementById('contact-form');
+
+if (contactForm) {
+    contactForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        // Get form inputs and button
+        const formInputs = this.querySelectorAll('.form__input');
+        const submitButton = this.querySelector('.form__button');
+
+        // Basic form validation
+        let isValid = true;
+        formInputs.forEach(input => {
+            if (input.hasAttribute('required') && !input.value.trim()) {
+                isValid = false;
+                input.style.borderColor = '#ef4444';
+                input.style.backgroundColor = 'rgba(239, 68, 68, 0.05)';
+            } else {
+                input.style.borderColor = 'var(--border-color)';
+                input.style.backgroundColor = 'var(--container-color)';
+            }
+        });
+
+        // Email validation
+        const emailInput = this.querySelector('input[type="email"]');
+        if (emailInput && emailInput.value) {
+            const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+            if (!emailRegex.test(emailInput.value)) {
+                isValid = false;
+                emailInput.style.borderColor = '#ef4444';
+                emailInput.style.backgroundColor = 'rgba(239, 68, 68, 0.05)';
+            }
+        }
+
+        if (!isValid) {
+            showNotification('Please fill in all required fields correctly.', 'error');
+            return;
+        }
+
+        // Prepare payload
+        const payload = {
+            name: this.querySelector('input#name') ? this.querySelector('input#name').value.trim() : '',
+            email: this.querySelector('input#email') ? this.querySelector('input#email').value.trim() : '',
+            subject: this.querySelector('input#subject') ? this.querySelector('input#subject').value.trim() : '',
+            message: this.querySelector('textarea#message') ? this.querySelector('textarea#message').value.trim() : ''
+        };
+
+        // Show loading state
+        submitButton.textContent = 'Sending...';
+        submitButton.disabled = true;
+
+        // Get CSRF token, then send to backend AJAX endpoint
+        getCsrfToken()
+        .then(csrfToken => fetch('/contact/ajax/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            },
+            body: JSON.stringify(payload),
+            credentials: 'same-origin'
+        }))
+        .then(response => response.json())
+        .then(data => {
+            if (data && data.success) {
+                contactForm.reset();
+                showNotification(data.message || 'Message sent successfully!', 'success');
+            } else {
+                showNotification((data && data.message) || 'There was an error sending your message.', 'error');
+            }
+        })
+        .catch(err => {
+            console.error('Contact form submit error:', err);
+            showNotification('There was a network error. Please try again later.', 'error');
+        })
+        .finally(() => {
+            submitButton.textContent = 'Send Message';
+            submitButton.disabled = false;
+        });
+    });
+}
+
+/* =============== CSRF TOKEN =============== */
+// Pre-rendered pages ship without a token, so ask the server for one
+function getCsrfToken() {
+    const tokenInput = document.querySelector('[name=csrfmiddlewaretoken]');
+    if (tokenInput && tokenInput.value) {
+        return Promise.resolve(tokenInput.value);
+    }
+    return fetch('/contact/token/', { credentials: 'same-origin' })
+        .then(response => response.json())
+        .then(data => {
+            if (tokenInput) tokenInput.value = data.token;
+            return data.token;
+        });
+}
@@ -0,0 +1,34 @@
+/* =============== GALLERY INFINITE SCROLL =============== */
+// Fetch the next page of cards near the bottom
+document.addEventListener('DOMContentLoaded', function() {
+    const grid = document.querySelector('.gallery-full__grid');
+    const more = document.getElementById('galleryMore');
+    if (!grid || !more || !('IntersectionObserver' in window)) return;
+
+    let loading = false;
+    const observer = new IntersectionObserver(entries => {
+        if (!entries[0].isIntersecting || loading) return;
+        const next = grid.querySelector('.gallery-full__next');
+        if (!next) {
+            observer.disconnect();
+            more.remove();
+            return;
+        }
+
+        loading = true;
+        fetch(next.dataset.nextUrl, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+            .then(response => response.ok ? response.text() : Promise.reject(response.status))
+            .then(html => {
+                next.remove();
+                grid.insertAdjacentHTML('beforeend', html);
+                if (!grid.querySelector('.gallery-full__next')) {
+                    observer.disconnect();
+                    more.remove();
+                }
+            })
+            .catch(error => console.error('Could not load more gallery items:', error))
+            .finally(() => { loading = false; });
+    }, { rootMargin: '600px 0px' });
+
+    observer.observe(more);
+});
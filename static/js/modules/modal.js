@@ -0,0 +1,119 @@
+/* =============== PROJECT MODAL =============== */
+const modalOverlay = document.querySelector('.modal');
+const modalClose = document.querySelector('.modal__close');
+
+// Project details are fetched on demand and kept for the rest of the visit
+const projectDetails = {};
+
+function fetchProjectDetails(projectId) {
+    if (!projectDetails[projectId]) {
+        projectDetails[projectId] = fetch(`/projects/${encodeURIComponent(projectId)}.json`, {
+            credentials: 'same-origin'
+        })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`Project request failed with status ${response.status}`);
+            }
+            return response.json();
+        })
+        .catch(err => {
+            // Allow a retry on the next click
+            delete projectDetails[projectId];
+            throw err;
+        });
+    }
+    return projectDetails[projectId];
+}
+
+// Open modal function
+function openModal(projectId) {
+    fetchProjectDetails(projectId)
+        .then(showProjectModal)
+        .catch(err => {
+            console.error('No project found with ID:', projectId, err);
+        });
+}
+
+function showProjectModal(project) {
+    // Update modal content
+    const modalTitle = document.querySelector('#modalTitle');
+    const modalCategory = document.querySelector('#modalCategory');
+    const modalDescription = document.querySelector('#modalDescription');
+    const modalImage = document.querySelector('.modal__image img');
+
+    if (modalTitle) modalTitle.textContent = project.title;
+    if (modalCategory) modalCategory.textContent = project.category;
+    if (modalDescription) modalDescription.textContent = project.description;
+    
+    if (modalImage) {
+        modalImage.src = project.image;
+        modalImage.alt = project.title;
+    }
+    
+    // Update specifications
+    const clientSpec = document.querySelector('[data-spec="client"] .modal__spec-value');
+    const dateSpec = document.querySelector('[data-spec="date"] .modal__spec-value');
+    
+    if (clientSpec) clientSpec.textContent = project.client;
+    if (dateSpec) dateSpec.textContent = project.date;
+
+    // Show modal with fade effect
+    if (modalOverlay && modalOverlay.style.display !== 'block') {
+        modalOverlay.style.display = 'block';
+        document.body.style.overflow = 'hidden';
+        
+        // Add animation class after a small delay to ensure the transition works
+        setTimeout(() => {
+            modalOverlay.classList.add('modal--active');
+        }, 10);
+    }
+}
+
+// Close modal function
+function closeModal() {
+    modalOverlay.classList.remove('modal--active');
+    
+    // Wait for animation to complete before hiding
+    setTimeout(() => {
+        modalOverlay.style.display = 'none';
+        document.body.style.overflow = '';
+    }, 300);
+}
+
+// Add click events to project cards
+document.addEventListener('DOMContentLoaded', () => {
+    // Add click events to Read More buttons
+    const readMoreButtons = document.querySelectorAll('.project__btn');
+    readMoreButtons.forEach(button => {
+        button.addEventListener('click', (e) => {
+            e.preventDefault();
+            const projectCard = button.closest('.project__card');
+            if (projectCard) {
+                const projectId = projectCard.getAttribute('data-project');
+                openModal(projectId);
+            }
+        });
+    });
+
+    // Close modal events
+    if (modalClose) {
+        modalClose.addEventListener('click', (e) => {
+            e.preventDefault();
+            closeModal();
+        });
+    }
+
+    // Close on overlay click
+    modalOverlay.addEventListener('click', (e) => {
+        if (e.target === modalOverlay) {
+            closeModal();
+        }
+    });
+
+    // Close on escape key
+    document.addEventListener('keydown', (e) => {
+        if (e.key === 'Escape' && modalOverlay.style.display === 'block') {
+            closeModal();
+        }
+    });
+});
@@ -0,0 +1,124 @@
+/* =============== NAVIGATION MENU =============== */
+const navMenu = document.getElementById('nav-menu');
+const navToggle = document.getElementById('nav-toggle');
+const navClose = document.getElementById('nav-close');
+const navLinks = document.querySelectorAll('.nav__link');
+
+// Show menu
+if (navToggle) {
+    navToggle.addEventListener('click', () => {
+        navMenu.classList.add('show-menu');
+    });
+}
+
+// Hide menu
+if (navClose) {
+    navClose.addEventListener('click', () => {
+        navMenu.classList.remove('show-menu');
+    });
+}
+
+// Close menu when clicking on nav links
+navLinks.forEach(link => {
+    link.addEventListener('click', () => {
+        navMenu.classList.remove('show-menu');
+    });
+});
+
+/* =============== ACTIVE NAVIGATION LINK =============== */
+const sections = document.querySelectorAll('section[id]');
+
+const scrollActive = () => {
+    const scrollY = window.pageYOffset;
+
+    sections.forEach(current => {
+        const sectionHeight = current.offsetHeight;
+        const sectionTop = current.offsetTop - 100;
+        const sectionId = current.getAttribute('id');
+        const sectionsClass = document.querySelector('.nav__menu a[href*=' + sectionId + ']');
+        if (!sectionsClass) return;
+
+        if (scrollY > sectionTop && scrollY <= sectionTop + sectionHeight) {
+            sectionsClass.classList.add('active-link');
+        } else {
+            sectionsClass.classList.remove('active-link');
+        }
+    });
+};
+
+/* =============== HEADER BACKGROUND ON SCROLL =============== */
+const scrollHeader = () => {
+    const header = document.getElementById('header');
+    // Add a class if the bottom offset is greater than 50 of the viewport
+    if (window.scrollY >= 50) {
+        header.classList.add('scroll-header');
+    } else {
+        header.classList.remove('scroll-header');
+    }
+};
+
+// Header style while scrolled
+const headerStyles = document.createElement('style');
+headerStyles.textContent = `
+    .scroll-header {
+        background-color: rgba(255, 255, 255, 0.98) !important;
+        box-shadow: 0 2px 12px rgba(15, 23, 42, 0.08) !important;
+    }
+`;
+document.head.appendChild(headerStyles);
+
+/* =============== SMOOTH SCROLLING =============== */
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        const target = document.querySelector(this.getAttribute('href'));
+        if (target) {
+            target.scrollIntoView({
+                behavior: 'smooth',
+                block: 'start'
+            });
+        }
+    });
+});
+
+/* =============== PERFORMANCE OPTIMIZATIONS =============== */
+// Debounce scroll events
+function debounce(func, wait) {
+    let timeout;
+    return function executedFunction(...args) {
+        const later = () => {
+            clearTimeout(timeout);
+            func(...args);
+        };
+        clearTimeout(timeout);
+        timeout = setTimeout(later, wait);
+    };
+}
+
+// Apply debouncing to scroll events
+const debouncedScrollActive = debounce(scrollActive, 10);
+const debouncedScrollHeader = debounce(scrollHeader, 10);
+
+window.addEventListener('scroll', debouncedScrollActive);
+window.addEventListener('scroll', debouncedScrollHeader);
+
+/* =============== ACCESSIBILITY IMPROVEMENTS =============== */
+// Keyboard navigation for mobile menu
+document.addEventListener('keydown', (e) => {
+    if (e.key === 'Escape' && navMenu.classList.contains('show-menu')) {
+        navMenu.classList.remove('show-menu');
+        if (navToggle) navToggle.focus();
+    }
+});
+
+// Focus management for mobile menu
+if (navToggle) {
+    navToggle.addEventListener('click', () => {
+        setTimeout(() => {
+            const firstNavLink = navMenu.querySelector('.nav__link');
+            if (firstNavLink) {
+                firstNavLink.focus();
+            }
+        }, 100);
+    });
+}
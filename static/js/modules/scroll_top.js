@@ -0,0 +1,30 @@
+/* =============== SCROLL TO TOP =============== */
+const scrollToTopBtn = document.getElementById('scrollToTop');
+let scrollTimeout;
+
+// Show/hide button based on scroll position
+if (scrollToTopBtn) window.addEventListener('scroll', () => {
+    if (window.scrollY > 300) {
+        scrollToTopBtn.classList.add('show');
+        
+        // Clear the existing timeout
+        if (scrollTimeout) {
+            clearTimeout(scrollTimeout);
+        }
+        
+        // Set new timeout to hide the button after 3 seconds
+        scrollTimeout = setTimeout(() => {
+            scrollToTopBtn.classList.remove('show');
+        }, 3000);
+    } else {
+        scrollToTopBtn.classList.remove('show');
+    }
+});
+
+// Scroll to top when button is clicked
+if (scrollToTopBtn) scrollToTopBtn.addEventListener('click', () => {
+    window.scrollTo({
+        top: 0,
+        behavior: 'smooth'
+    });
+});
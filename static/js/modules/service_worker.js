@@ -0,0 +1,9 @@
+/* =============== SERVICE WORKER =============== */
+// Precaches the hashed static files and keeps recently seen images
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(err => {
+            console.error('Service worker registration failed:', err);
+        });
+    });
+}
@@ -0,0 +1,10 @@
+/* =============== THEME MANAGEMENT =============== */
+// Future enhancement: Add theme switching capability
+function initializeTheme() {
+    // Check for saved theme preference or default to 'light'
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+}
+
+// Initialize theme on page load
+document.addEventListener('DOMContentLoaded', initializeTheme);
@@ -0,0 +1,94 @@
+{% autoescape off %}// Service Worker for Vishwakarma Mechfab
+// Generated by vmf_app.service_worker - do not edit the served copy
+// Version changes whenever the collected static files change
+
+const VERSION = '{{ version }}';
+const STATIC_CACHE = `vmf-static-${VERSION}`;
+// Renamed when cached entries must go: earlier workers also stored opaque responses
+const IMAGE_CACHE = 'vmf-images-v2';
+const IMAGE_CACHE_LIMIT = {{ image_cache_limit }};
+const PRECACHE_URLS = {{ precache_urls }};
+const CORS_IMAGE_HOSTS = {{ cors_image_hosts }};
+
+/* =============== INSTALL: PRECACHE HASHED ASSETS =============== */
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(STATIC_CACHE)
+            .then(cache => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+/* =============== ACTIVATE: DROP OLD VERSIONS =============== */
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(
+                names
+                    .filter(name => name.startsWith('vmf-') && name !== STATIC_CACHE && name !== IMAGE_CACHE)
+                    .map(name => caches.delete(name))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+/* =============== FETCH =============== */
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+
+    // Hashed assets never change, so the precache answers without the network
+    if (url.origin === self.location.origin && PRECACHE_URLS.includes(url.pathname)) {
+        event.respondWith(
+            caches.match(request, { cacheName: STATIC_CACHE })
+                .then(cached => cached || fetch(request))
+        );
+        return;
+    }
+
+    // Gallery and project images: answer from cache, refresh in the background
+    // Other cross-origin images would come back opaque: their status cannot be
+    // checked and each takes megabytes of quota, so they are left alone
+    if (request.destination === 'image') {
+        if (url.origin === self.location.origin) {
+            event.respondWith(staleWhileRevalidate(event, request, request));
+        } else if (url.protocol === 'https:' && CORS_IMAGE_HOSTS.includes(url.hostname)) {
+            const corsRequest = new Request(request.url, { mode: 'cors', credentials: 'omit' });
+            // Without the expected CORS headers, the page's own request still works
+            event.respondWith(staleWhileRevalidate(event, request, corsRequest).catch(() => fetch(request)));
+        }
+    }
+});
+
+function staleWhileRevalidate(event, request, networkRequest) {
+    return caches.open(IMAGE_CACHE).then(cache =>
+        cache.match(request).then(cached => {
+            const network = fetch(networkRequest)
+                .then(response => {
+                    if (response.ok) {
+                        return cache.put(request, response.clone())
+                            .then(() => trimCache(cache))
+                            .then(() => response);
+                    }
+                    return response;
+                });
+
+            if (cached) {
+                event.waitUntil(network.catch(() => undefined));
+                return cached;
+            }
+            return network;
+        })
+    );
+}
+
+function trimCache(cache) {
+    return cache.keys().then(keys => {
+        // Oldest entries are first in insertion order
+        const excess = keys.length - IMAGE_CACHE_LIMIT;
+        return Promise.all(keys.slice(0, Math.max(excess, 0)).map(key => cache.delete(key)));
+    });
+}
+{% endautoescape %}
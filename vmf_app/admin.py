@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.models import User, Group
-from .models import AboutSection, Service, Project, GalleryItem, ContactInfo, ContactSubmission
+from django.utils import timezone
+from .models import AboutSection, Service, Project, GalleryItem, ContactInfo, ContactSubmission, Job
 
 # Customize Django Admin Site
 admin.site.site_header = "Vishwakarma MechFab Administration"
@@ -197,6 +198,11 @@ class GalleryItemAdmin(admin.ModelAdmin):
             'fields': ('media_file', 'media_url'),
             'description': 'Upload image file (recommended) OR provide external image URL'
         }),
+        ('Thumbnail', {
+            'fields': ('thumbnail_file', 'thumbnail_url'),
+            'classes': ('collapse',),
+            'description': 'Generated automatically from the uploaded image. Upload one here to override it, or give a URL for external images'
+        }),
         ('Display Settings', {
             'fields': ('is_featured', 'is_active', 'display_order'),
             'description': 'Featured items appear on homepage (max 2). Active items visible in gallery.'
@@ -330,3 +336,47 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
         actions['mark_as_archived'] = (mark_as_archived, 'mark_as_archived', mark_as_archived.short_description)
         
         return actions
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Status of the background jobs run by `manage.py run_jobs`"""
+    
+    list_display = ['task', 'args', 'queue', 'status', 'attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'queue', 'task']
+    search_fields = ['task', 'last_error']
+    show_facets = admin.ShowFacets.ALWAYS
+    readonly_fields = [
+        'task', 'args', 'queue', 'status', 'attempts', 'max_attempts', 'run_at',
+        'locked_by', 'locked_at', 'last_error', 'created_at', 'finished_at',
+    ]
+    actions = ['retry_jobs']
+    
+    fieldsets = (
+        ('Job', {
+            'fields': ('task', 'args', 'queue'),
+        }),
+        ('Status', {
+            'fields': ('status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'locked_at', 'finished_at'),
+        }),
+        ('Last Error', {
+            'fields': ('last_error',),
+            'classes': ('collapse',),
+        }),
+        ('Timestamps', {
+            'fields': ('created_at',),
+            'classes': ('collapse',),
+        }),
+    )
+    
+    def has_add_permission(self, request):
+        """Jobs are queued by the application, not by hand"""
+        return False
+    
+    @admin.action(description="Retry selected jobs now")
+    def retry_jobs(self, request, queryset):
+        """Queue failed or waiting jobs to run immediately with fresh attempts"""
+        count = queryset.exclude(status='running').update(
+            status='queued', attempts=0, run_at=timezone.now(), finished_at=None
+        )
+        self.message_user(request, f"{count} jobs queued to run again.")
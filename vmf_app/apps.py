@@ -5,3 +5,7 @@ class VmfAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vmf_app"
     verbose_name = "Vishwakarma MechFab Content Management"
+
+    def ready(self):
+        # Connect cache invalidation handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,34 @@
+"""
+Front-end asset layout for the public VMF pages
+The site script is split into feature modules under static/js/modules;
+`manage.py build_js_bundles` joins them into bundles (hashed by the
+collectstatic manifest storage) and writes a page -> bundle manifest
+that {% page_scripts %} reads
+"""
+
+JS_MODULE_DIR = 'js/modules'
+JS_MANIFEST = 'js/manifest.json'
+
+# Bundle name -> feature modules, in load order
+JS_BUNDLES = {
+    'core': ['navigation', 'scroll_top', 'theme', 'service_worker'],
+    'index': ['animations', 'notifications', 'contact', 'modal', 'video'],
+    'gallery': ['gallery'],
+    'projects': ['animations', 'modal'],
+}
+
+# Page -> bundles it loads; core is shared so browsers cache it once
+PAGE_BUNDLES = {
+    'index': ['core', 'index'],
+    'gallery': ['core', 'gallery'],
+    'projects': ['core', 'projects'],
+}
+
+
+def page_modules(page):
+    """Static paths of the unbundled modules a page loads"""
+    return [
+        f'{JS_MODULE_DIR}/{module}.js'
+        for bundle in PAGE_BUNDLES[page]
+        for module in JS_BUNDLES[bundle]
+    ]
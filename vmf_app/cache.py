@@ -0,0 +1,269 @@
+"""
+Page caching helpers for the public VMF pages
+Rendered responses are stored per content version, and the version is
+bumped whenever public content is saved or deleted in the admin
+"""
+
+import hashlib
+import re
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+
+from .compression import choose_encoding, compressed_variants
+
+CONTENT_VERSION_KEY = 'vmf:content_version'
+# The only query parameters the public views read; anything else would
+# only create duplicate cache entries
+PAGE_QUERY_PARAMS = ('category', 'after')
+PAGE_CACHE_TIMEOUT = getattr(settings, 'VMF_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+# The CSRF token is per visitor, so shared pages carry an empty one and the
+# contact form fetches its own from the contact_token view
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def get_version(key):
+    """Return the version stamp stored under key, creating one if missing"""
+    version = cache.get(key)
+    if version is None:
+        version = str(time.time_ns())
+        cache.set(key, version, None)
+    return version
+
+
+def bump_version(key):
+    """Replace the version stamp under key so dependent caches go stale"""
+    cache.set(key, str(time.time_ns()), None)
+
+
+def get_content_version():
+    """Return the current public content version"""
+    return get_version(CONTENT_VERSION_KEY)
+
+
+def bump_content_version():
+    """Start a new content version so every cached page becomes stale"""
+    bump_version(CONTENT_VERSION_KEY)
+
+
+def get_build_id():
+    """
+    Hash of the collectstatic manifest, so a deploy with new asset names
+    changes the page validators ('' without manifest storage)
+    """
+    return getattr(staticfiles_storage, 'manifest_hash', '') or ''
+
+
+def page_cache_key(request):
+    """Build the cache key for a public page request, ignoring unknown query parameters"""
+    params = sorted((name, request.GET[name]) for name in PAGE_QUERY_PARAMS if name in request.GET)
+    path = hashlib.md5(f'{request.path}?{urlencode(params)}'.encode('utf-8')).hexdigest()
+    return f'vmf:page:{get_content_version()}:{path}'
+
+
+def strip_csrf_token(content, charset='utf-8'):
+    """Blank the per-visitor CSRF token in rendered HTML bytes"""
+    html = content.decode(charset)
+    return CSRF_INPUT_RE.sub(r'\g<1>\g<2>', html).encode(charset)
+
+
+def build_cached_response(request, cached):
+    """
+    Build a response from a cached page entry
+    The smallest variant the client accepts is sent as-is, so pages are
+    compressed once per content version rather than once per request
+    """
+    encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), cached['variants'])
+    content = cached['variants'][encoding] if encoding else cached['content']
+
+    response = HttpResponse(content, content_type=cached['content_type'])
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def _lookup_page(request):
+    """Return (cache key, cached entry or None) for a page request"""
+    key = page_cache_key(request)
+    return key, cache.get(key)
+
+
+def _store_page(key, response):
+    """Store a rendered response with its compressed variants, if cacheable"""
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return None
+
+    content = response.content
+    if response['Content-Type'].startswith('text/html'):
+        content = strip_csrf_token(content, response.charset)
+    cached = {
+        'content': content,
+        'content_type': response['Content-Type'],
+        'variants': compressed_variants(content, fast=True),
+    }
+    cache.set(key, cached, PAGE_CACHE_TIMEOUT)
+    return cached
+
+
+def _store_streamed_page(key, response):
+    """Store a streamed response once its last chunk has gone out"""
+    if response.status_code != 200 or response.cookies:
+        return response
+
+    chunks = []
+
+    def store():
+        _store_page(key, HttpResponse(b''.join(chunks), content_type=response['Content-Type']))
+
+    # An interrupted stream never reaches store(), so partial pages are not kept
+    if response.is_async:
+        async def content(streaming_content):
+            async for chunk in streaming_content:
+                chunks.append(chunk)
+                yield chunk
+            await sync_to_async(store)()
+    else:
+        def content(streaming_content):
+            for chunk in streaming_content:
+                chunks.append(chunk)
+                yield chunk
+            store()
+
+    response.streaming_content = content(response.streaming_content)
+    return response
+
+
+def cache_public_page(view_func):
+    """
+    Cache the rendered response of a public page until content changes
+    Only successful GET/HEAD responses are stored, along with their
+    gzip/brotli variants; streamed pages are stored after the last chunk.
+    Works for both sync and async views
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+
+            key, cached = await sync_to_async(_lookup_page)(request)
+            if cached is None:
+                response = await view_func(request, *args, **kwargs)
+                if response.streaming:
+                    return _store_streamed_page(key, response)
+                cached = await sync_to_async(_store_page)(key, response)
+                if cached is None:
+                    return response
+            return build_cached_response(request, cached)
+
+        return _wrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_func(request, *args, **kwargs)
+
+        key, cached = _lookup_page(request)
+        if cached is None:
+            response = view_func(request, *args, **kwargs)
+            if response.streaming:
+                return _store_streamed_page(key, response)
+            cached = _store_page(key, response)
+            if cached is None:
+                return response
+        return build_cached_response(request, cached)
+
+    return _wrapped_view
+
+
+def get_content_stamp(models):
+    """
+    Return an (etag, last_modified) pair for the given content models
+    Built from row counts and the newest updated_at, so deletions count too,
+    plus the content version and build id: image jobs write with update()
+    (no updated_at change) and asset builds change the markup on their own
+    """
+    labels = ','.join(model._meta.label_lower for model in models)
+    version = get_content_version()
+    build_id = get_build_id()
+    key = f'vmf:stamp:{version}:{build_id}:{labels}'
+    stamp = cache.get(key)
+    if stamp is None:
+        parts = [f'version:{version}', f'build:{build_id}']
+        for model in models:
+            summary = model.objects.aggregate(latest=Max('updated_at'), total=Count('pk'))
+            latest = summary['latest']
+            parts.append(f"{model._meta.label_lower}:{summary['total']}:{latest.isoformat() if latest else ''}")
+        # The stamp is rebuilt after every bump and deploy, so this is never
+        # earlier than the last change, including update()-only ones
+        last_modified = timezone.now()
+        etag = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+        stamp = (etag, last_modified)
+        cache.set(key, stamp, PAGE_CACHE_TIMEOUT)
+    return stamp
+
+
+def _check_preconditions(request, models):
+    """Return (304 response or None, etag, last modified timestamp) for a page"""
+    etag, last_modified = get_content_stamp(models)
+    etag = quote_etag(etag)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    return response, etag, timestamp
+
+
+def _add_validators(request, response, etag, timestamp):
+    """Add ETag/Last-Modified and revalidation headers to a page response"""
+    # Error pages get none, so a client never revalidates its way back to a
+    # cached error; the 304 only answers validators handed out with a 200
+    if request.method in ('GET', 'HEAD') and response.status_code in (200, 304):
+        if timestamp and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(timestamp)
+        response.headers.setdefault('ETag', etag)
+
+    # Browsers must revalidate, which is cheap thanks to the validators
+    patch_cache_control(response, no_cache=True)
+    # Encoded bodies differ byte-wise from the identity one
+    if response.has_header('Content-Encoding') and not response.get('ETag', 'W/').startswith('W/'):
+        response['ETag'] = f"W/{response['ETag']}"
+    return response
+
+
+def conditional_public_page(*models):
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before the view runs
+    The validators are derived from the models the page renders
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                response, etag, timestamp = await sync_to_async(_check_preconditions)(request, models)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _add_validators(request, response, etag, timestamp)
+        else:
+            @wraps(view_func)
+            def _wrapped_view(request, *args, **kwargs):
+                response, etag, timestamp = _check_preconditions(request, models)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                return _add_validators(request, response, etag, timestamp)
+
+        # Lets other tools (e.g. prerender_site) know what the page depends on
+        _wrapped_view.content_models = models
+        return _wrapped_view
+
+    return decorator
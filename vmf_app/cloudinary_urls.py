@@ -0,0 +1,68 @@
+"""
+Cloudinary delivery URLs
+Images hosted on Cloudinary can be resized and re-encoded by Cloudinary
+itself: a transformation segment after /upload/ (f_auto,q_auto,w_800)
+makes it send AVIF/WebP at a sensible quality and the requested size.
+These helpers add that segment to stored URLs and build srcsets from it,
+so remote images get responsive delivery without moving any files
+"""
+
+import re
+
+from django.conf import settings
+
+from .images import DERIVATIVE_WIDTHS
+
+TRANSFORMS_ENABLED = getattr(settings, 'VMF_CLOUDINARY_TRANSFORMS', True)
+CLOUDINARY_HOST = 'res.cloudinary.com'
+# Device pixel ratios offered for images shown at a fixed size
+DPR_VARIANTS = (1, 2)
+# https://res.cloudinary.com/<cloud>/image/upload/[<transformations>/]v123/<public id>
+UPLOAD_URL_RE = re.compile(r'^(https?://res\.cloudinary\.com/[^/]+/image/upload/)(.+)$')
+# A path segment that is already a transformation (w_800, c_fill,h_300, ...)
+TRANSFORMATION_RE = re.compile(r'^[a-z]{1,3}_[^/]*$')
+
+
+def is_cloudinary(url):
+    """Whether a URL is a Cloudinary image upload that can take transformations"""
+    return bool(TRANSFORMS_ENABLED and url and UPLOAD_URL_RE.match(url))
+
+
+def transform_url(url, width=None, height=None, dpr=None):
+    """
+    A Cloudinary URL with automatic format and quality, limited to the
+    given size (never upscaled); other URLs are returned unchanged
+    URLs that already carry a transformation are left as they are
+    """
+    match = UPLOAD_URL_RE.match(url or '') if TRANSFORMS_ENABLED else None
+    if match is None:
+        return url
+    prefix, rest = match.groups()
+    if TRANSFORMATION_RE.match(rest.split('/', 1)[0]):
+        return url
+
+    parts = ['f_auto', 'q_auto']
+    if width or height:
+        parts.append('c_limit')
+    if width:
+        parts.append(f'w_{width}')
+    if height:
+        parts.append(f'h_{height}')
+    if dpr and dpr != 1:
+        parts.append(f'dpr_{dpr:.1f}')
+    return f'{prefix}{",".join(parts)}/{rest}'
+
+
+def width_srcset(url, max_width=None):
+    """srcset with a w descriptor per derivative width, up to max_width"""
+    widths = [width for width in DERIVATIVE_WIDTHS if max_width is None or width <= max_width]
+    if max_width and max_width not in widths:
+        widths.append(max_width)
+    return ', '.join(f'{transform_url(url, width=width)} {width}w' for width in widths)
+
+
+def dpr_srcset(url, width=None, height=None):
+    """srcset with x descriptors, for an image shown at one fixed size"""
+    return ', '.join(
+        f'{transform_url(url, width=width, height=height, dpr=dpr)} {dpr}x' for dpr in DPR_VARIANTS
+    )
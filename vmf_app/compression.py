@@ -0,0 +1,75 @@
+"""
+Compression helpers shared by the page exporter and response compression
+Brotli is optional, as it is for WhiteNoise: without the brotli package
+only gzip variants are produced
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Smaller inputs gain nothing from compression
+MIN_COMPRESS_SIZE = 200
+# Offline (prerender_site) output is compressed as hard as possible; pages
+# cached inside a request use levels that take a few milliseconds
+BEST_LEVELS = {'gzip': 9, 'br': 11}
+FAST_LEVELS = {'gzip': 6, 'br': 5}
+
+
+def gzip_compress(content, level=BEST_LEVELS['gzip']):
+    """Return gzip-compressed bytes with a fixed mtime so output is stable"""
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def brotli_compress(content, quality=BEST_LEVELS['br']):
+    """Return brotli-compressed bytes, or None when brotli is not installed"""
+    if brotli is None:
+        return None
+    return brotli.compress(content, mode=brotli.MODE_TEXT, quality=quality)
+
+
+def compressed_variants(content, fast=False):
+    """
+    Return {encoding: bytes} for every available encoding
+    `fast` trades a little size for speed, for compression on the request
+    path. Variants that are not smaller than the original are dropped
+    """
+    if len(content) < MIN_COMPRESS_SIZE:
+        return {}
+
+    levels = FAST_LEVELS if fast else BEST_LEVELS
+    variants = {'gzip': gzip_compress(content, levels['gzip'])}
+    brotli_content = brotli_compress(content, levels['br'])
+    if brotli_content is not None:
+        variants['br'] = brotli_content
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(content)}
+
+
+def choose_encoding(accept_encoding, variants):
+    """
+    Pick the available encoding the client rates highest (q-value) in an
+    Accept-Encoding header, preferring brotli on a tie
+    Returns None when the client should get the uncompressed body
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ('br', 'gzip'):
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if encoding in variants and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
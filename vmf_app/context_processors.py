@@ -0,0 +1,16 @@
+"""
+Template context processors for VMF
+"""
+
+from django.utils.functional import SimpleLazyObject
+
+from .models import AboutSection, ContactInfo
+from .singletons import get_singleton
+
+
+def site_content(request):
+    """Expose the cached AboutSection and ContactInfo singletons to every template"""
+    return {
+        'about_section': SimpleLazyObject(lambda: get_singleton(AboutSection)),
+        'contact_info': SimpleLazyObject(lambda: get_singleton(ContactInfo)),
+    }
@@ -0,0 +1,137 @@
+"""
+Critical CSS extraction for the public VMF pages
+The stylesheet is purged of selectors no template or script uses, and the
+rules needed above the fold are picked out per page so they can be inlined
+"""
+
+import re
+from pathlib import Path
+
+from django.template.loader import get_template
+
+INCLUDE_RE = re.compile(r"""{%\s*include\s+['"]([^'"]+)['"][^%]*%}""")
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+# Every word that could be a tag, class or id name (as PurgeCSS extracts them)
+TOKEN_RE = re.compile(r'[A-Za-z0-9_-]+')
+# Class names built at runtime, e.g. `notification--${type}` or "card-{{ kind }}"
+DYNAMIC_PREFIX_RE = re.compile(r'([A-Za-z][\w-]*)(?:\$\{|{{)')
+
+SELECTOR_CLASS_RE = re.compile(r'[.#]([A-Za-z_][\w-]*)')
+SELECTOR_TYPE_RE = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][\w-]*)')
+# Pseudo-classes/elements and attribute tests say nothing about markup usage
+SELECTOR_PSEUDO_RE = re.compile(r'::?[\w-]+(\([^)]*\))?|\[[^\]]*\]')
+
+# Rules that apply to every page regardless of markup
+ALWAYS_KEEP = {'*', 'html', 'body', ':root'}
+# Wrapping at-rules whose contents are filtered like top-level rules
+GROUPING_AT_RULES = ('@media', '@supports')
+
+
+def expand_template(template_name):
+    """Return the source of a template with its includes inlined"""
+    source = Path(get_template(template_name).origin.name).read_text(encoding='utf-8')
+    return INCLUDE_RE.sub(lambda match: expand_template(match.group(1)), source)
+
+
+def above_the_fold(source):
+    """The markup up to the end of the first section after the header"""
+    end = source.find('</section>')
+    return source if end == -1 else source[:end]
+
+
+class UsedNames:
+    """Words found in markup and scripts, plus prefixes of generated class names"""
+
+    def __init__(self, *sources):
+        self.tokens = set()
+        self.prefixes = set()
+        for source in sources:
+            self.tokens.update(TOKEN_RE.findall(source))
+            self.prefixes.update(DYNAMIC_PREFIX_RE.findall(source))
+
+    def __contains__(self, name):
+        return name in self.tokens or any(name.startswith(prefix) for prefix in self.prefixes)
+
+
+def selector_used(selector, used):
+    """Whether every class, id and tag in a selector occurs in the markup"""
+    selector = selector.strip()
+    if selector in ALWAYS_KEEP or selector.startswith('@'):
+        return True
+    stripped = SELECTOR_PSEUDO_RE.sub('', selector)
+    names = SELECTOR_CLASS_RE.findall(stripped)
+    names += SELECTOR_TYPE_RE.findall(SELECTOR_CLASS_RE.sub('', stripped))
+    return all(name in used for name in names)
+
+
+def parse_css(css):
+    """
+    Parse CSS into a list of (prelude, body) pairs in source order
+    Grouping at-rules get a list of nested pairs as body, statements like
+    @import get None
+    """
+    css = COMMENT_RE.sub('', css)
+    rules = []
+    position = 0
+    while position < len(css):
+        brace = css.find('{', position)
+        semicolon = css.find(';', position)
+        if brace == -1:
+            break
+        if css[position:].lstrip().startswith('@') and -1 < semicolon < brace:
+            rules.append((css[position:semicolon].strip(), None))
+            position = semicolon + 1
+            continue
+
+        depth = 1
+        end = brace + 1
+        while depth and end < len(css):
+            depth += {'{': 1, '}': -1}.get(css[end], 0)
+            end += 1
+        prelude = ' '.join(css[position:brace].split())
+        body = css[brace + 1:end - 1]
+        if prelude.startswith(GROUPING_AT_RULES):
+            body = parse_css(body)
+        rules.append((prelude, body))
+        position = end
+    return rules
+
+
+def minify_declarations(body):
+    """Collapse the whitespace in a declaration block"""
+    declarations = []
+    for declaration in body.split(';'):
+        prop, _, value = declaration.partition(':')
+        if value.strip():
+            declarations.append(f"{prop.strip()}:{' '.join(value.split())}")
+    return ';'.join(declarations)
+
+
+def filter_rules(rules, used):
+    """Keep only the selectors used by the markup and return minified CSS"""
+    output = []
+    for prelude, body in rules:
+        if body is None:
+            output.append(f'{prelude};')
+        elif isinstance(body, list):
+            nested = filter_rules(body, used)
+            if nested:
+                output.append(f'{prelude}{{{nested}}}')
+        elif prelude.startswith('@'):
+            # @font-face, @keyframes and friends are kept whole
+            output.append(f'{prelude}{{{" ".join(body.split())}}}')
+        else:
+            selectors = [selector.strip() for selector in prelude.split(',')]
+            kept = [selector for selector in selectors if selector_used(selector, used)]
+            if kept:
+                output.append(f"{','.join(kept)}{{{minify_declarations(body)}}}")
+    return ''.join(output)
+
+
+def drop_unused_keyframes(css):
+    """Remove @keyframes blocks whose animation is not referenced elsewhere"""
+    def keep(match):
+        name = match.group(1)
+        rest = css[:match.start()] + css[match.end():]
+        return match.group(0) if re.search(rf'\b{re.escape(name)}\b', rest) else ''
+    return re.sub(r'@(?:-webkit-)?keyframes\s+([\w-]+)\{(?:[^{}]*\{[^{}]*\})*[^{}]*\}', keep, css)
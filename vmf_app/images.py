@@ -0,0 +1,380 @@
+"""
+Responsive image derivatives for uploaded VMF media
+When a model's image file changes, downscaled copies are written in the
+modern formats Pillow can encode to the content-addressed storage
+(`cas/<ab>/<sha256>.<format>`, see storage.py), and their metadata is
+stored on the model so templates can emit srcset without touching the
+storage. Gallery items
+also get a card thumbnail, cropped around the busiest part of the image,
+and every image a tiny inline placeholder shown while it loads. The
+upright size and dominant colour are recorded on the model (for external
+URLs from the file header and a tiny Cloudinary copy, which also gives
+their placeholder, see remote_images.py), so pages can reserve each
+image's box before it arrives
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import ExifTags, Image, ImageFilter, ImageOps, ImageStat, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = tuple(getattr(settings, 'VMF_IMAGE_WIDTHS', (480, 800, 1200, 1600)))
+# Preferred first; the <picture> sources are emitted in this order
+DERIVATIVE_FORMATS = tuple(getattr(settings, 'VMF_IMAGE_FORMATS', ('avif', 'webp')))
+# Encoder options per format (AVIF holds up at a lower quality setting)
+ENCODER_OPTIONS = {
+    'avif': {'quality': 55, 'speed': 6},
+    'webp': {'quality': 80, 'method': 4},
+}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+# Gallery card thumbnails: 2x the desktop card, in its aspect ratio
+THUMBNAIL_SIZE = tuple(getattr(settings, 'VMF_THUMBNAIL_SIZE', (960, 560)))
+# Crop windows tried along the axis being cut
+CROP_POSITIONS = 9
+# Longest side of the inline placeholder; the browser's upscaling blurs it
+PLACEHOLDER_SIZE = 16
+# Size the image is reduced to before picking its dominant colour
+COLOR_SAMPLE_SIZE = 64
+# EXIF orientations that turn the image on its side
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def available_formats():
+    """The derivative formats this Pillow build can encode"""
+    return [fmt for fmt in DERIVATIVE_FORMATS if features.check(fmt)]
+
+
+def derivative_widths(source_width):
+    """Widths to generate for a source image; never upscales"""
+    widths = [width for width in DERIVATIVE_WIDTHS if width < source_width]
+    # The largest derivative is the source itself (capped), so wide screens get a modern format too
+    widths.append(min(source_width, max(DERIVATIVE_WIDTHS)))
+    return sorted(set(widths))
+
+
+def derivative_name(source_name, width, fmt):
+    """
+    Name one derivative is saved under, e.g. gallery/derivatives/photo-800w.webp
+    The storage names it by content, keeping only the extension
+    """
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'derivatives', f'{stem}-{width}w.{fmt}')
+
+
+def load_image(field_file):
+    """Open an uploaded image upright in RGB(A), or None if Pillow cannot decode it"""
+    try:
+        with field_file.open('rb') as source, Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, OSError) as error:
+        logger.warning('Cannot process image %s: %s', field_file.name, error)
+        return None
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    return image
+
+
+def build_variants(field_file):
+    """
+    Generate the derivatives of an image file and return their metadata
+    Files Pillow cannot decode (e.g. a video in the gallery) get an empty
+    variant list, so they are not retried on every save
+    """
+    metadata = {'source': field_file.name, 'variants': []}
+    image = load_image(field_file)
+    if image is None:
+        return metadata
+    metadata['width'], metadata['height'] = image.size
+    metadata['placeholder'] = build_placeholder(image)
+
+    storage = field_file.storage
+    for width in derivative_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in available_formats():
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), **ENCODER_OPTIONS.get(fmt, {}))
+            content = buffer.getvalue()
+            name = storage.save(derivative_name(field_file.name, width, fmt), ContentFile(content))
+            metadata['variants'].append({
+                'name': name,
+                'format': fmt,
+                'width': width,
+                'height': height,
+                'size': len(content),
+            })
+    return metadata
+
+
+def build_placeholder(image):
+    """
+    A few hundred bytes of the image as a data URI, drawn behind the card
+    until the real image arrives; '' for images with transparency, which
+    would show the placeholder through
+    """
+    if image.mode == 'RGBA' and image.getchannel('A').getextrema()[0] < 255:
+        return ''
+    small = image.convert('RGB')
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    fmt = 'webp' if features.check('webp') else 'jpeg'
+    buffer = io.BytesIO()
+    small.save(buffer, format=fmt.upper(), quality=50)
+    return f'data:image/{fmt};base64,{base64.b64encode(buffer.getvalue()).decode("ascii")}'
+
+
+def delete_variants(metadata, storage):
+    """Remove the derivative files listed in a model's metadata"""
+    for variant in (metadata or {}).get('variants', []):
+        storage.delete(variant['name'])
+
+
+def variants_outdated(instance):
+    """Whether the derivatives were built from another file (or before placeholders)"""
+    field_file = getattr(instance, instance.responsive_image_field)
+    source = field_file.name if field_file else ''
+    metadata = instance.image_variants or {}
+    if metadata.get('source', '') != source:
+        return True
+    return bool(metadata.get('width')) and 'placeholder' not in metadata
+
+
+def needs_processing(instance):
+    """Whether a saved instance's derivatives, size or thumbnail are out of date"""
+    if variants_outdated(instance) or dimensions_missing(instance):
+        return True
+    field_file = getattr(instance, instance.responsive_image_field)
+    source = field_file.name if field_file else ''
+    # Gallery images whose thumbnail was cleared in the admin
+    return bool(
+        hasattr(instance, 'thumbnail_file') and source
+        and instance.media_type == 'image' and not instance.thumbnail_file
+    )
+
+
+def refresh_variants(instance, force=False):
+    """
+    Regenerate a saved instance's derivatives if they are out of date
+    The model names the file field in `responsive_image_field`; metadata
+    is written with update() so the save signals do not fire twice.
+    Returns whether the derivatives were rebuilt
+    """
+    field_file = getattr(instance, instance.responsive_image_field)
+    source = field_file.name if field_file else ''
+    current = instance.image_variants or {}
+    if not (force or variants_outdated(instance)):
+        return False
+
+    # Old references go first; identical content saved again is stored like new
+    delete_variants(current, field_file.storage)
+    metadata = build_variants(field_file) if source else {}
+    instance.image_variants = metadata
+    type(instance).objects.filter(pk=instance.pk).update(image_variants=metadata)
+    return True
+
+
+def image_sources(metadata, storage):
+    """(MIME type, srcset) pairs for the formats a model has derivatives in"""
+    sources = []
+    for fmt in DERIVATIVE_FORMATS:
+        candidates = [
+            f"{storage.url(variant['name'])} {variant['width']}w"
+            for variant in (metadata or {}).get('variants', [])
+            if variant['format'] == fmt
+        ]
+        if candidates:
+            sources.append((MIME_TYPES[fmt], ', '.join(candidates)))
+    return sources
+
+
+def file_digest(field_file):
+    """SHA-256 of a stored file's content"""
+    digest = hashlib.sha256()
+    with field_file.open('rb') as source:
+        for chunk in source.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upright_size(image):
+    """An opened image's width and height once its EXIF orientation is applied"""
+    width, height = image.size
+    if image.getexif().get(ExifTags.Base.Orientation, 1) in ROTATED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def dominant_color(image):
+    """The most common colour of an image as #rrggbb, from a small median-cut palette"""
+    sample = image.convert('RGB')
+    sample.thumbnail((COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+    palette_image = sample.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    _, index = max(palette_image.getcolors())
+    red, green, blue = palette_image.getpalette()[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def image_summary(source):
+    """
+    (width, height, dominant colour) of an image file object
+    JPEGs are decoded at a fraction of their size, which is all the colour needs
+    """
+    with Image.open(source) as image:
+        width, height = upright_size(image)
+        image.draft('RGB', (COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+        return width, height, dominant_color(image)
+
+
+def dimensions_missing(instance):
+    """Whether an item shows an image whose size (or external placeholder) has not been recorded yet"""
+    if getattr(instance, 'media_type', 'image') != 'image':
+        return False
+    if getattr(instance, instance.responsive_image_field):
+        return instance.image_width is None
+    if not instance.get_external_image_url():
+        return False
+    # Uploads get their placeholder with the derivatives, external images with the size
+    return instance.image_width is None or 'placeholder' not in (instance.image_variants or {})
+
+
+def refresh_dimensions(instance, force=False):
+    """
+    Record the size and dominant colour of an item's image, read from the
+    upload or probed from the external URL (along with its placeholder);
+    returns whether they were found
+    """
+    if getattr(instance, 'media_type', 'image') != 'image':
+        return False
+    if not (force or dimensions_missing(instance)):
+        return False
+
+    field_file = getattr(instance, instance.responsive_image_field)
+    summary = None
+    fields = {}
+    if field_file:
+        try:
+            with field_file.open('rb') as source:
+                summary = image_summary(source)
+        except (UnidentifiedImageError, OSError) as error:
+            logger.warning('Cannot read the size of %s: %s', field_file.name, error)
+    elif instance.get_external_image_url():
+        from .remote_images import remote_image_summary
+        summary = remote_image_summary(instance.get_external_image_url())
+        if summary is not None:
+            *summary, placeholder = summary
+            # There are no derivatives to keep it with, '' still marks it as tried
+            instance.image_variants = fields['image_variants'] = {'placeholder': placeholder}
+    if summary is None:
+        return False
+
+    instance.image_width, instance.image_height, instance.dominant_color = summary
+    type(instance).objects.filter(pk=instance.pk).update(
+        image_width=instance.image_width,
+        image_height=instance.image_height,
+        dominant_color=instance.dominant_color,
+        **fields,
+    )
+    return True
+
+
+def smart_crop(image, size):
+    """
+    Crop an image to the aspect ratio of size and scale it down to fit
+    The crop window slides along the axis being cut and the one with the
+    most edge detail wins, with a slight preference for the centre
+    """
+    target_width, target_height = size
+    width, height = image.size
+    if width * target_height > height * target_width:
+        crop_width, crop_height = round(height * target_width / target_height), height
+    else:
+        crop_width, crop_height = width, round(width * target_height / target_width)
+
+    # Score the windows on a small greyscale edge map
+    scale = min(1, 256 / max(width, height))
+    edges = image.convert('L').resize(
+        (max(1, round(width * scale)), max(1, round(height * scale)))
+    ).filter(ImageFilter.FIND_EDGES)
+
+    best_box, best_score = None, -1
+    for step in range(CROP_POSITIONS):
+        offset = step / (CROP_POSITIONS - 1)
+        left = round((width - crop_width) * offset)
+        top = round((height - crop_height) * offset)
+        box = (left, top, left + crop_width, top + crop_height)
+        scaled = tuple(max(0, round(edge * scale)) for edge in box)
+        score = ImageStat.Stat(edges.crop(scaled)).mean[0] * (1 - 0.2 * abs(offset - 0.5))
+        if score > best_score:
+            best_box, best_score = box, score
+
+    cropped = image.crop(best_box)
+    if crop_width > target_width:
+        cropped = cropped.resize(size, Image.Resampling.LANCZOS)
+    return cropped
+
+
+def thumbnail_format():
+    """WebP when this Pillow build has it, JPEG otherwise"""
+    return 'webp' if features.check('webp') else 'jpeg'
+
+
+def generated_thumbnail(item):
+    """The item's thumbnail name if it was generated, '' for one uploaded by hand"""
+    # The source hash is cleared when a thumbnail is uploaded in the admin
+    if item.thumbnail_source_hash and item.thumbnail_file:
+        return item.thumbnail_file.name
+    return ''
+
+
+def refresh_thumbnail(item, force=False):
+    """
+    Regenerate a gallery item's thumbnail_file if its media_file content changed
+    The source hash is kept on the item, so re-saving or re-uploading the
+    same image is a no-op. A thumbnail uploaded in the admin takes
+    precedence. Returns whether a thumbnail was written
+    """
+    media_file = item.media_file
+    previous = generated_thumbnail(item)
+    # A thumbnail uploaded by hand is left alone
+    if item.thumbnail_file and not previous:
+        return False
+    digest = file_digest(media_file) if media_file else ''
+    # Unchanged content; a cleared thumbnail of an uploaded image is made again
+    missing = media_file and item.media_type == 'image' and not item.thumbnail_file
+    if digest == item.thumbnail_source_hash and not missing and not force:
+        return False
+
+    storage = item.thumbnail_file.storage
+    # Removed uploads, videos and undecodable files end up without a thumbnail
+    name = ''
+    image = load_image(media_file) if media_file else None
+    if image is not None:
+        fmt = thumbnail_format()
+        buffer = io.BytesIO()
+        thumbnail = smart_crop(image, THUMBNAIL_SIZE)
+        if fmt == 'jpeg':
+            thumbnail = thumbnail.convert('RGB')
+        thumbnail.save(buffer, format=fmt.upper(), quality=80)
+        stem = posixpath.splitext(posixpath.basename(media_file.name))[0]
+        # The hash in the name makes a thumbnail URL safe to cache forever
+        name = item.thumbnail_file.field.generate_filename(item, f'{stem}-{digest[:12]}.{fmt}')
+        name = storage.save(name, ContentFile(buffer.getvalue()))
+
+    # Content-addressed storage counts the save above even for an identical
+    # thumbnail, so the previous one is always released
+    if previous:
+        storage.delete(previous)
+    item.thumbnail_file.name = name
+    item.thumbnail_source_hash = digest
+    type(item).objects.filter(pk=item.pk).update(thumbnail_file=name, thumbnail_source_hash=digest)
+    return image is not None
@@ -0,0 +1,221 @@
+"""
+Database-backed background jobs
+Slow work (image processing and the like) is queued as Job rows in the
+same transaction as the change that caused it, and run by one or more
+`manage.py run_jobs` workers. Only the database is needed: workers claim
+jobs with a conditional UPDATE, failed attempts are retried with
+exponential backoff, and each queue has a limit on jobs running at once
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connections, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Registered task functions by name (filled by the @task decorator)
+TASKS = {}
+
+# Queue name -> jobs allowed to run at once across all workers
+QUEUE_LIMITS = getattr(settings, 'VMF_JOB_QUEUES', {'default': 2})
+RETRY_BASE_DELAY = getattr(settings, 'VMF_JOB_RETRY_DELAY', 30)
+RETRY_MAX_DELAY = 3600
+# A running job older than this is assumed to belong to a dead worker
+JOB_TIMEOUT = getattr(settings, 'VMF_JOB_TIMEOUT', 600)
+# Seconds between a worker's checks for jobs left running by a dead worker
+STALE_CHECK_INTERVAL = 60
+
+
+def run_inline():
+    """Whether jobs run right after the commit instead of on a worker"""
+    return getattr(settings, 'VMF_RUN_JOBS_INLINE', True)
+
+
+def task(queue='default', max_attempts=5):
+    """Register a function as a task that can be passed to enqueue()"""
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__name__}'
+        func.queue = queue
+        func.max_attempts = max_attempts
+        TASKS[func.task_name] = func
+        return func
+    return register
+
+
+def _run_now(func, args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Inline job %s%r failed', func.task_name, tuple(args))
+
+
+def enqueue(func, *args):
+    """
+    Queue a task; arguments must be JSON serialisable
+    The row is written in the caller's transaction, so a rolled back change
+    never leaves a job behind. A matching job still waiting is reused
+    """
+    if run_inline():
+        transaction.on_commit(lambda: _run_now(func, args))
+        return None
+
+    waiting = Job.objects.filter(task=func.task_name, args=list(args), status='queued').first()
+    if waiting is not None:
+        return waiting
+    return Job.objects.create(
+        task=func.task_name, args=list(args), queue=func.queue, max_attempts=func.max_attempts
+    )
+
+
+def retry_delay(attempts):
+    """Seconds before the next attempt: doubling from the base delay, with jitter"""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def requeue_stale_jobs():
+    """
+    Put jobs whose worker died mid-run back in the queue; returns how many
+    A job out of attempts is failed instead, as it may be what killed the
+    worker (e.g. running out of memory on a huge image)
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=JOB_TIMEOUT))
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=now, locked_by='', locked_at=None,
+        last_error=f'Still running after {JOB_TIMEOUT}s on its last attempt; the worker probably died',
+    )
+    return stale.update(status='queued', run_at=now, locked_by='', locked_at=None)
+
+
+def claim_job(worker_id):
+    """Take the next due job on a queue below its limit, or return None"""
+    now = timezone.now()
+    with transaction.atomic():
+        running = Job.objects.filter(status='running').values_list('queue').annotate(total=Count('id')).order_by()
+        full = [queue for queue, total in running if total >= QUEUE_LIMITS.get(queue, 1)]
+        job = (
+            Job.objects.filter(status='queued', run_at__lte=now)
+            .exclude(queue__in=full)
+            .order_by('run_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        # Another worker may have taken it since the SELECT
+        claimed = Job.objects.filter(pk=job.pk, status='queued').update(
+            status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """Run a claimed job and record the outcome; returns whether it succeeded"""
+    func = TASKS.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f'No task registered as {job.task}')
+        func(*job.args)
+    except Exception:
+        logger.exception('Job %s (%s) failed on attempt %s', job.pk, job.task, job.attempts)
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            update = {'status': 'failed', 'finished_at': now}
+        else:
+            update = {'status': 'queued', 'run_at': now + timedelta(seconds=retry_delay(job.attempts))}
+        Job.objects.filter(pk=job.pk).update(
+            locked_by='', locked_at=None, last_error=traceback.format_exc(), **update
+        )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status='done', finished_at=timezone.now(), locked_by='', locked_at=None, last_error=''
+    )
+    return True
+
+
+def purge_finished_jobs(days):
+    """Delete jobs that succeeded more than `days` days ago"""
+    cutoff = timezone.now() - timedelta(days=days)
+    return Job.objects.filter(status='done', finished_at__lt=cutoff).delete()[0]
+
+
+class Worker:
+    """A pool of threads claiming and running jobs until stopped"""
+
+    def __init__(self, concurrency=1, poll_interval=2.0, drain=False):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        # Exit once no job is due instead of polling for more
+        self.drain = drain
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self._count_lock = threading.Lock()
+        self._next_stale_check = 0
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+
+    def stop(self):
+        """Finish the running jobs, then exit"""
+        self.stopping.set()
+
+    def _stale_check_due(self):
+        """Whether this thread should look for stale jobs (one thread per interval)"""
+        now = time.monotonic()
+        with self._count_lock:
+            if now < self._next_stale_check:
+                return False
+            self._next_stale_check = now + STALE_CHECK_INTERVAL
+            return True
+
+    def _loop(self, worker_id):
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    # Stale jobs count against their queue's limit until requeued
+                    if self._stale_check_due():
+                        requeue_stale_jobs()
+                    job = claim_job(worker_id)
+                except DatabaseError:
+                    # e.g. the database stayed locked past the timeout; try again later
+                    logger.exception('Worker %s could not claim a job', worker_id)
+                    job = None
+                if job is None:
+                    if self.drain:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                succeeded = run_job(job)
+                with self._count_lock:
+                    self.processed += 1
+                    self.failed += not succeeded
+        finally:
+            connections.close_all()
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self._loop, args=(f'{self.name}:{index}',), daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            # join() with a timeout keeps the main thread responsive to signals
+            while thread.is_alive():
+                thread.join(timeout=1)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from vmf_app.cache import bump_content_version
+from vmf_app.images import dimensions_missing, refresh_dimensions
+from vmf_app.models import GalleryItem, Project
+
+
+class Command(BaseCommand):
+    help = (
+        'Record the width, height and dominant colour (and, for external images, the placeholder) '
+        'of project and gallery images that do not have them yet'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Measure every image again, not only those without a recorded size or placeholder',
+        )
+
+    def handle(self, *args, **options):
+        recorded = 0
+        failed = 0
+        for model in (Project, GalleryItem):
+            # Checked per item: external images may have a size but no placeholder
+            for item in model.objects.all():
+                if refresh_dimensions(item, force=options['force']):
+                    recorded += 1
+                    self.stdout.write(self.style.SUCCESS(
+                        f'✓ {model._meta.verbose_name} "{item}": '
+                        f'{item.image_width}x{item.image_height} {item.dominant_color}'
+                    ))
+                elif dimensions_missing(item):
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'⚠ {model._meta.verbose_name} "{item}": size not found'))
+
+        if recorded:
+            # Cached pages were rendered without width/height
+            bump_content_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Recorded the size of {recorded} image(s), {failed} could not be read'
+        ))
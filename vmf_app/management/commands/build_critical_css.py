@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from vmf_app.cache import bump_content_version
+from vmf_app.critical_css import (
+    UsedNames, above_the_fold, drop_unused_keyframes, expand_template, filter_rules, parse_css,
+)
+
+SOURCE_STYLESHEET = 'css/styles.css'
+# Page name -> template; the critical CSS is inlined by {% critical_css 'name' %}
+PAGES = {
+    'index': 'index.html',
+    'gallery': 'gallery.html',
+    'projects': 'projects.html',
+}
+
+
+class Command(BaseCommand):
+    help = 'Purge unused selectors from styles.css and extract the above-the-fold CSS of each page (run before collectstatic)'
+
+    def handle(self, *args, **kwargs):
+        source_path = finders.find(SOURCE_STYLESHEET)
+        if source_path is None:
+            raise CommandError(f'{SOURCE_STYLESHEET} not found in the static files directories.')
+        rules = parse_css(Path(source_path).read_text(encoding='utf-8'))
+
+        # Scripts add classes at runtime, so they count as markup too
+        scripts = [
+            path.read_text(encoding='utf-8')
+            for directory in settings.STATICFILES_DIRS
+            for path in Path(directory).glob('js/**/*.js')
+            if 'build' not in path.relative_to(directory).parts
+        ]
+        pages = {name: expand_template(template) for name, template in PAGES.items()}
+
+        build_dir = Path(settings.VMF_ASSET_BUILD_DIR) / 'css'
+        build_dir.mkdir(parents=True, exist_ok=True)
+        original_size = Path(source_path).stat().st_size
+
+        purged = drop_unused_keyframes(filter_rules(rules, UsedNames(*pages.values(), *scripts)))
+        (build_dir / 'styles.css').write_text(purged, encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Purged stylesheet: {original_size // 1024} KB -> {len(purged) // 1024} KB'
+        ))
+
+        for name, source in pages.items():
+            critical = drop_unused_keyframes(filter_rules(rules, UsedNames(above_the_fold(source))))
+            (build_dir / f'{name}.critical.css').write_text(critical, encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Critical CSS for {name}: {len(critical) // 1024} KB inlined'
+            ))
+
+        # Cached pages carry the old inlined CSS
+        bump_content_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✅ CSS build written to {build_dir}')
+        )
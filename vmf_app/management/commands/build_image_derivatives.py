@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from vmf_app.cache import bump_content_version
+from vmf_app.images import available_formats, refresh_thumbnail, refresh_variants
+from vmf_app.models import GalleryItem, Project
+
+
+class Command(BaseCommand):
+    help = 'Generate the responsive WebP/AVIF derivatives and gallery thumbnails for uploaded images that do not have them yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild every derivative, e.g. after changing VMF_IMAGE_WIDTHS or VMF_THUMBNAIL_SIZE',
+        )
+
+    def handle(self, *args, **options):
+        formats = available_formats()
+        if not formats:
+            self.stdout.write(self.style.WARNING('⚠ This Pillow build encodes neither WebP nor AVIF'))
+
+        rebuilt = 0
+        for model in (Project, GalleryItem):
+            field = model.responsive_image_field
+            items = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+            for item in items:
+                if not refresh_variants(item, force=options['force']):
+                    continue
+                rebuilt += 1
+                variants = item.image_variants.get('variants', [])
+                total = sum(variant['size'] for variant in variants)
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ {model._meta.verbose_name} "{item}": {len(variants)} derivatives ({total // 1024} KB)'
+                ))
+
+        thumbnails = 0
+        for item in GalleryItem.objects.exclude(media_file__isnull=True).exclude(media_file=''):
+            if refresh_thumbnail(item, force=options['force']):
+                thumbnails += 1
+                self.stdout.write(self.style.SUCCESS(f'✓ Thumbnail for "{item}": {item.thumbnail_file.name}'))
+
+        if rebuilt or thumbnails:
+            # Cached pages were rendered without the new srcsets
+            bump_content_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Derivatives built for {rebuilt} item(s) in {", ".join(formats) or "no formats"}, '
+            f'{thumbnails} thumbnail(s) generated'
+        ))
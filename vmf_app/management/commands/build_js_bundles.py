@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from vmf_app.assets import JS_BUNDLES, JS_MANIFEST, JS_MODULE_DIR, PAGE_BUNDLES
+from vmf_app.cache import bump_content_version
+
+
+class Command(BaseCommand):
+    help = 'Join the JavaScript feature modules into per-page bundles (run before collectstatic)'
+
+    def handle(self, *args, **kwargs):
+        build_dir = Path(settings.VMF_ASSET_BUILD_DIR)
+        js_dir = build_dir / 'js'
+        js_dir.mkdir(parents=True, exist_ok=True)
+
+        bundle_paths = {}
+        for bundle, modules in JS_BUNDLES.items():
+            sources = []
+            for module in modules:
+                path = finders.find(f'{JS_MODULE_DIR}/{module}.js')
+                if path is None:
+                    raise CommandError(f'Module {module}.js not found in {JS_MODULE_DIR}.')
+                sources.append(Path(path).read_text(encoding='utf-8'))
+
+            content = '\n'.join(sources).encode('utf-8')
+            # collectstatic's manifest storage adds the content hash to the name
+            name = f'{bundle}.js'
+            (js_dir / name).write_bytes(content)
+            bundle_paths[bundle] = f'build/js/{name}'
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Bundle {name}: {", ".join(modules)} ({len(content) // 1024} KB)'
+            ))
+
+        manifest = {
+            page: [bundle_paths[bundle] for bundle in bundles]
+            for page, bundles in PAGE_BUNDLES.items()
+        }
+        (build_dir / JS_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+        # Drop bundles from earlier builds
+        current = {Path(path).name for path in bundle_paths.values()}
+        for path in js_dir.glob('*.js'):
+            if path.name not in current:
+                path.unlink()
+
+        # Cached pages still point at the previous bundles
+        bump_content_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✅ JavaScript bundles written to {js_dir}')
+        )
@@ -0,0 +1,107 @@
+import re
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.http import Http404
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from vmf_app import views
+from vmf_app.models import GalleryItem, Project
+from vmf_app.pagination import encode_cursor
+from vmf_app.singletons import SINGLETON_MODELS, get_singletons
+
+# "SCAN table" without an index, or an extra sort step, means a missing index
+FULL_SCAN_RE = re.compile(r'^SCAN (\S+)$')
+TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE')
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN QUERY PLAN on every query the public views issue and fail on full scans or temp sorts'
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plan checks are only supported on SQLite.')
+
+        queries = self.capture_view_queries()
+        self.stdout.write(f'Checking {len(queries)} queries...\n')
+
+        problems = []
+        for sql, params in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+
+            bad_steps = [step for step in plan if FULL_SCAN_RE.match(step) or TEMP_SORT_RE.search(step)]
+            if bad_steps:
+                problems.append((sql, plan))
+                self.stdout.write(self.style.ERROR(f'✗ {sql}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {sql}'))
+            for step in plan:
+                self.stdout.write(f'    {step}')
+
+        if problems:
+            raise CommandError(f'{len(problems)} queries do a full table scan or temp B-tree sort.')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✅ All {len(queries)} public queries use an index!')
+        )
+
+    def capture_view_queries(self):
+        """Run every public view with caching disabled and collect its SELECTs"""
+        factory = RequestFactory()
+
+        # Exercise the keyset path even when the gallery is empty
+        item = GalleryItem.objects.filter(is_active=True).first()
+        if item is None:
+            item = GalleryItem(pk=0, display_order=0, created_at=timezone.now())
+        cursor = encode_cursor(item)
+        category = GalleryItem.CATEGORY_CHOICES[0][0]
+        # A missing slug still runs the lookup before the 404
+        slug = Project.objects.filter(is_active=True).values_list('slug', flat=True).first() or 'missing'
+
+        requests = [
+            (views.index, '/', {}),
+            (views.gallery, '/gallery/', {}),
+            (views.gallery, f'/gallery/?category={category}', {}),
+            (views.gallery_items, f'/gallery/items/?after={cursor}', {}),
+            (views.gallery_items, f'/gallery/items/?after={cursor}&category={category}', {}),
+            (views.projects, '/projects/', {}),
+            (views.project_detail, f'/projects/{slug}.json', {'slug': slug}),
+        ]
+
+        queries = {}
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                queries.setdefault(sql, params)
+            return execute(sql, params, many, context)
+
+        def watch_connection(sender, connection, **kwargs):
+            # Async views run some queries on worker threads with their own connection
+            connection.execute_wrappers.append(record)
+
+        dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        connection_created.connect(watch_connection)
+        try:
+            with override_settings(CACHES=dummy_cache), connection.execute_wrapper(record):
+                for view, path, kwargs in requests:
+                    if iscoroutinefunction(view):
+                        view = async_to_sync(view)
+                    try:
+                        response = view(factory.get(path), **kwargs)
+                    except Http404:
+                        continue
+                    if response.streaming:
+                        # Streamed pages only load their content while being sent
+                        b''.join(response.streaming_content)
+                # Templates only touch the singletons when they use them
+                get_singletons(*SINGLETON_MODELS)
+        finally:
+            connection_created.disconnect(watch_connection)
+
+        return list(queries.items())
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from vmf_app.cache import bump_content_version
+from vmf_app.signals import STORED_FILE_FIELDS
+from vmf_app.storage import is_content_name
+
+
+class Command(BaseCommand):
+    help = 'Move uploads stored before content addressing into media/cas/, keeping one copy per unique file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the files that would be moved',
+        )
+
+    def handle(self, *args, **options):
+        moved = {}
+        missing = 0
+        for model, fields in STORED_FILE_FIELDS.items():
+            for item in model.objects.all():
+                updates = {}
+                for field in fields:
+                    field_file = getattr(item, field)
+                    if not field_file or is_content_name(field_file.name):
+                        continue
+                    if not field_file.storage.exists(field_file.name):
+                        missing += 1
+                        self.stdout.write(self.style.WARNING(f'⚠ {model.__name__} {item.pk}: {field_file.name} is missing'))
+                        continue
+                    if options['dry_run']:
+                        self.stdout.write(f'{model.__name__} {item.pk}: {field_file.name}')
+                        moved[field_file.name] = None
+                        continue
+
+                    with field_file.open('rb'):
+                        updates[field] = field_file.storage.save(field_file.name, field_file)
+                    moved[field_file.name] = field_file.storage
+                    self.stdout.write(self.style.SUCCESS(f'✓ {field_file.name} -> {updates[field]}'))
+                if updates:
+                    model.objects.filter(pk=item.pk).update(**updates)
+
+        if options['dry_run']:
+            self.stdout.write(f'\n{len(moved)} file(s) would be moved')
+            return
+
+        # Every row pointing at a legacy name now has its content-addressed copy
+        for name, storage in moved.items():
+            storage.delete(name)
+        if moved:
+            bump_content_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Moved {len(moved)} file(s) into content-addressed storage ({missing} missing). '
+            f'Run build_image_derivatives to rebuild the derivatives under the new names.'
+        ))
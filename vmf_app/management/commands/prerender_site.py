@@ -0,0 +1,170 @@
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count, Max
+from django.test import RequestFactory
+
+from vmf_app import views
+from vmf_app.cache import get_build_id, strip_csrf_token
+from vmf_app.compression import compressed_variants
+from vmf_app.models import Project
+
+MANIFEST_NAME = '.prerender-manifest.json'
+ENCODING_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+# Written by the image jobs with update(), which leaves updated_at alone
+IMAGE_FIELDS = ('image_variants', 'image_width', 'image_height', 'dominant_color')
+
+
+def _init_worker():
+    """Make sure Django is ready in pool workers started with spawn"""
+    import django
+    django.setup()
+
+
+def _write_atomic(path, content):
+    """Write a file so WhiteNoise never sees it half written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def _digest(value):
+    """Short hash of a JSON-serialisable value"""
+    return hashlib.md5(json.dumps(value, default=str).encode('utf-8')).hexdigest()
+
+
+def page_stamp(models):
+    """
+    Stamp of what a page renders: row counts and the newest updated_at of
+    its models, their image metadata, and the static build id
+    Unlike the page ETag it ignores the content version, which every
+    admin save bumps, so only the pages that save touches are rebuilt
+    """
+    parts = [f'build:{get_build_id()}']
+    for model in models:
+        summary = model.objects.aggregate(latest=Max('updated_at'), total=Count('pk'))
+        latest = summary['latest']
+        parts.append(f"{model._meta.label_lower}:{summary['total']}:{latest.isoformat() if latest else ''}")
+        if hasattr(model, 'responsive_image_field'):
+            fields = [field for field in (*IMAGE_FIELDS, 'thumbnail_file') if hasattr(model, field)]
+            parts.append(_digest(list(model.objects.order_by('pk').values_list('pk', *fields))))
+    return _digest(parts)
+
+
+def render_page(job):
+    """Render one page with its undecorated view and write it plus compressed copies"""
+    view_name, url, output, kwargs, root = job
+    view = inspect.unwrap(getattr(views, view_name))
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(RequestFactory().get(url), **kwargs)
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+
+    # Pre-rendered pages are shared, so the form fetches its own CSRF token
+    if response['Content-Type'].startswith('text/html'):
+        content = strip_csrf_token(content, response.charset)
+
+    path = Path(root) / output
+    _write_atomic(path, content)
+    variants = compressed_variants(content)
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        variant_path = path.with_name(path.name + suffix)
+        if encoding in variants:
+            _write_atomic(variant_path, variants[encoding])
+        elif variant_path.exists():
+            variant_path.unlink()
+    return output
+
+
+class Command(BaseCommand):
+    help = 'Render the public pages to static files (with .gz/.br copies) for WhiteNoise to serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render every page, e.g. after a template change',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of render processes (1 renders in this process)',
+        )
+
+    def handle(self, *args, **kwargs):
+        root = Path(settings.VMF_PRERENDER_ROOT)
+        root.mkdir(parents=True, exist_ok=True)
+        manifest_path = root / MANIFEST_NAME
+        manifest = {}
+        if manifest_path.exists() and not kwargs['force']:
+            manifest = json.loads(manifest_path.read_text())
+
+        pages = self.collect_pages()
+        jobs = [
+            (view_name, url, output, view_kwargs, str(root))
+            for output, (view_name, url, view_kwargs, stamp) in pages.items()
+            if manifest.get(output) != stamp or not (root / output).exists()
+        ]
+        self.stdout.write(f'{len(jobs)} of {len(pages)} pages need rendering...')
+
+        if jobs:
+            workers = max(1, min(kwargs['workers'], len(jobs)))
+            if workers == 1:
+                rendered = [render_page(job) for job in jobs]
+            else:
+                # Forked workers must not share the parent's database connection
+                connections.close_all()
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                    rendered = list(executor.map(render_page, jobs))
+            for output in rendered:
+                self.stdout.write(self.style.SUCCESS(f'✓ Rendered: {output}'))
+
+        # Drop pages whose rows are gone (e.g. deleted or hidden projects)
+        for output in set(manifest) - set(pages):
+            path = root / output
+            for stale in [path] + [path.with_name(path.name + suffix) for suffix in ENCODING_SUFFIXES.values()]:
+                if stale.exists():
+                    stale.unlink()
+            self.stdout.write(self.style.WARNING(f'✗ Removed: {output}'))
+
+        new_manifest = {output: stamp for output, (_, _, _, stamp) in pages.items()}
+        _write_atomic(manifest_path, json.dumps(new_manifest, indent=2).encode('utf-8'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✅ Pre-rendered site is up to date in {root}')
+        )
+
+    def collect_pages(self):
+        """
+        Return {output file: (view name, url, view kwargs, source stamp)}
+        The gallery is left to Django: WhiteNoise ignores the query string,
+        so ?category= and ?after= would get the unfiltered first page
+        """
+        pages = {}
+        for view_name, url, output in [
+            ('index', '/', 'index.html'),
+            ('projects', '/projects/', 'projects/index.html'),
+        ]:
+            models = getattr(views, view_name).content_models
+            pages[output] = (view_name, url, {}, page_stamp(models))
+
+        # Per-project modal payloads change with their own row, or with
+        # update()-only changes such as new image derivatives
+        rows = Project.objects.filter(is_active=True).values_list(
+            'slug', 'updated_at', 'image_variants', 'image_width', 'image_height'
+        )
+        for slug, updated_at, *image in rows:
+            pages[f'projects/{slug}.json'] = (
+                'project_detail', f'/projects/{slug}.json', {'slug': slug}, f'{updated_at.isoformat()}:{_digest(image)}'
+            )
+        return pages
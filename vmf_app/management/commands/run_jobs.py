@@ -0,0 +1,56 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from vmf_app.jobs import QUEUE_LIMITS, Worker, purge_finished_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (image processing and other work moved out of requests)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Jobs this worker runs at once (queue limits in VMF_JOB_QUEUES still apply)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait before looking again when no job is due',
+        )
+        parser.add_argument(
+            '--drain',
+            action='store_true',
+            help='Exit once no job is due, e.g. when run from cron',
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=7,
+            help='Delete jobs that succeeded longer ago than this on startup',
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_finished_jobs(options['keep_days'])
+        if purged:
+            self.stdout.write(self.style.SUCCESS(f'✓ Purged {purged} finished job(s)'))
+
+        worker = Worker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            drain=options['drain'],
+        )
+        # Let running jobs finish on Ctrl+C or a service manager's stop
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+
+        limits = ', '.join(f'{queue}={limit}' for queue, limit in QUEUE_LIMITS.items())
+        self.stdout.write(f'Worker {worker.name} running {options["concurrency"]} thread(s), queue limits: {limits}')
+        worker.run()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Worker stopped: {worker.processed} job(s) run, {worker.failed} failed'
+        ))
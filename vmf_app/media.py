@@ -0,0 +1,241 @@
+"""
+Production serving of uploaded media
+Files under MEDIA_ROOT are answered with strong validators and cache
+headers. The transfer itself is handed to the front proxy
+(X-Accel-Redirect for nginx, X-Sendfile for Apache/lighttpd) when one is
+configured, otherwise it goes out as a FileResponse, which gunicorn sends
+with sendfile(). Without a proxy, byte ranges (single and multipart) are
+answered here, so videos can seek and resume
+"""
+
+import mimetypes
+import re
+import uuid
+from pathlib import Path
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+# '' (Django sends the file), 'x-accel-redirect' (nginx) or 'x-sendfile'
+MEDIA_SENDFILE = getattr(settings, 'VMF_MEDIA_SENDFILE', '')
+# Internal nginx location aliased to MEDIA_ROOT
+MEDIA_ACCEL_PREFIX = getattr(settings, 'VMF_MEDIA_ACCEL_PREFIX', '/protected-media/')
+MEDIA_MAX_AGE = getattr(settings, 'VMF_MEDIA_MAX_AGE', 86400)
+# Content-addressed uploads (cas/ab/<sha256>.jpg) and generated files with a
+# content hash in the name never change
+HASHED_NAME_RE = re.compile(r'(?:^cas/[0-9a-f]{2}/[0-9a-f]{64}|-[0-9a-f]{12})\.\w+$')
+IMMUTABLE_MAX_AGE = 31536000
+
+# Bytes read per chunk when the file is streamed by Python
+MEDIA_CHUNK_SIZE = 64 * 1024
+# More ranges than this in one request get the whole file instead
+MAX_RANGES = 16
+RANGE_SPEC_RE = re.compile(r'^(\d*)-(\d*)$')
+
+
+def media_name(path):
+    """The MEDIA_ROOT-relative name for a request path under MEDIA_URL, else None"""
+    if settings.MEDIA_URL and path.startswith(settings.MEDIA_URL):
+        return path[len(settings.MEDIA_URL):]
+    return None
+
+
+def resolve_media(name):
+    """The file a media name refers to, or None if it is missing or outside MEDIA_ROOT"""
+    try:
+        path = Path(safe_join(settings.MEDIA_ROOT, name))
+    except (SuspiciousFileOperation, ValueError):
+        return None
+    return path if path.is_file() else None
+
+
+def media_validators(stat):
+    """Strong ETag and Last-Modified for a file, from its size and mtime"""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"', int(stat.st_mtime)
+
+
+def parse_range(header, size):
+    """
+    The byte ranges of a Range header as sorted, merged (start, end) pairs
+    Returns None when the header is malformed or asks for too many ranges
+    (the whole file is sent then) and [] when no range can be satisfied
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+
+    ranges = []
+    for part in spec.split(','):
+        match = RANGE_SPEC_RE.match(part.strip())
+        if match is None or match.group(0) == '-':
+            return None
+        first, last = match.groups()
+        if not first:
+            # Suffix range: the final `last` bytes
+            if int(last) and size:
+                ranges.append((max(0, size - int(last)), size - 1))
+            continue
+        start, end = int(first), int(last) if last else None
+        if end is not None and end < start:
+            return None
+        if start < size:
+            ranges.append((start, size - 1 if end is None else min(end, size - 1)))
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def if_range_matches(request, etag, last_modified):
+    """Whether a Range request still applies (If-Range names the current file)"""
+    value = request.META.get('HTTP_IF_RANGE')
+    if value is None:
+        return True
+    if value.startswith(('"', 'W/')):
+        # Strong comparison: a weak tag never matches
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+def read_ranges(path, ranges):
+    """Yield the bytes of each (start, end) range of a file in bounded chunks"""
+    with path.open('rb') as file:
+        for start, end in ranges:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(MEDIA_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+
+def multipart_ranges(path, ranges, content_type, size):
+    """A multipart/byteranges body and its length; returns (boundary, length, iterator)"""
+    boundary = uuid.uuid4().hex
+    headers = [
+        (f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\n'
+         f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n').encode('ascii')
+        for start, end in ranges
+    ]
+    closing = f'\r\n--{boundary}--\r\n'.encode('ascii')
+    length = sum(map(len, headers)) + sum(end - start + 1 for start, end in ranges) + len(closing)
+
+    def body():
+        for header, byte_range in zip(headers, ranges):
+            yield header
+            yield from read_ranges(path, [byte_range])
+        yield closing
+    return boundary, length, body()
+
+
+def stream_for(request, iterator):
+    """
+    Streaming content suited to the server: ASGI gets an async iterator, as
+    Django would otherwise read a sync one into memory in full
+    """
+    if not isinstance(request, ASGIRequest):
+        return iterator
+
+    async def content():
+        while (chunk := await sync_to_async(next, thread_sensitive=False)(iterator, None)) is not None:
+            yield chunk
+    return content()
+
+
+def range_response(request, path, ranges, content_type, size):
+    """206 Partial Content for one or several byte ranges, read as they are sent"""
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(
+            stream_for(request, read_ranges(path, ranges)), status=206, content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        boundary, length, body = multipart_ranges(path, ranges, content_type, size)
+        response = StreamingHttpResponse(
+            stream_for(request, body), status=206, content_type=f'multipart/byteranges; boundary={boundary}'
+        )
+        response['Content-Length'] = length
+    return response
+
+
+def add_media_headers(response, name, etag, last_modified):
+    """Validators and caching headers shared by full and 304 responses"""
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if HASHED_NAME_RE.search(name):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MEDIA_MAX_AGE)
+    return response
+
+
+def media_body_response(request, path, name, stat, etag, last_modified):
+    """The response carrying the file's bytes, or the proxy's instructions to send them"""
+    content_type, encoding = mimetypes.guess_type(name)
+    content_type = content_type or 'application/octet-stream'
+    size = stat.st_size
+
+    # Proxies answer Range requests themselves
+    ranges = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and not MEDIA_SENDFILE and request.method == 'GET':
+        if if_range_matches(request, etag, last_modified):
+            ranges = parse_range(range_header, size)
+
+    if MEDIA_SENDFILE == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(MEDIA_ACCEL_PREFIX + name)
+    elif MEDIA_SENDFILE == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = str(path)
+    elif ranges == []:
+        response = HttpResponse(status=416, content_type=content_type)
+        response['Content-Range'] = f'bytes */{size}'
+    elif ranges:
+        response = range_response(request, path, ranges, content_type, size)
+    elif request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Length'] = size
+    elif isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(
+            stream_for(request, read_ranges(path, [(0, size - 1)])), content_type=content_type
+        )
+        response['Content-Length'] = size
+    else:
+        response = FileResponse(path.open('rb'), content_type=content_type)
+
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
+
+
+def serve_media(request, name):
+    """Serve one uploaded file; conditional requests are answered with 304"""
+    path = resolve_media(name)
+    if path is None:
+        raise Http404('Media file not found')
+
+    stat = path.stat()
+    etag, last_modified = media_validators(stat)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = media_body_response(request, path, name, stat, etag, last_modified)
+    return add_media_headers(response, name, etag, last_modified)
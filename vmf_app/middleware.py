@@ -1,19 +1,46 @@
 """
 Custom Security Middleware for VMF Project
 Adds additional security headers and protections
+Both middlewares only touch the response, so they support sync and
+async requests and never force a thread switch under ASGI.
+MediaFilesMiddleware answers /media/ requests before the session, CSRF
+and auth middleware run
 """
 
-class SecurityHeadersMiddleware:
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .media import media_name, serve_media
+
+
+class ResponseMiddleware:
     """
-    Middleware to add security headers to all responses
+    Base for middleware that only post-processes the response
+    Subclasses implement process_response(request, response)
     """
-    
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
-        
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+
+class SecurityHeadersMiddleware(ResponseMiddleware):
+    """
+    Middleware to add security headers to all responses
+    """
+
+    def process_response(self, request, response):
         # Content Security Policy
         csp_directives = [
             "default-src 'self'",
@@ -28,7 +55,8 @@ class SecurityHeadersMiddleware:
             "form-action 'self'",
             "upgrade-insecure-requests"
         ]
-        response['Content-Security-Policy'] = '; '.join(csp_directives)
+        # Views may set a stricter or wider policy of their own (e.g. the service worker)
+        response.headers.setdefault('Content-Security-Policy', '; '.join(csp_directives))
         
         # Additional Security Headers
         response['X-Content-Type-Options'] = 'nosniff'
@@ -50,17 +78,12 @@ class SecurityHeadersMiddleware:
         return response
 
 
-class AdminSecurityMiddleware:
+class AdminSecurityMiddleware(ResponseMiddleware):
     """
     Additional security for admin pages
     """
-    
-    def __init__(self, get_response):
-        self.get_response = get_response
 
-    def __call__(self, request):
-        response = self.get_response(request)
-        
+    def process_response(self, request, response):
         # Log admin access attempts (after authentication middleware has run)
         if (request.path.startswith('/admin') and 
             hasattr(request, 'user') and 
@@ -79,4 +102,41 @@ class AdminSecurityMiddleware:
             ip = x_forwarded_for.split(',')[0]
         else:
             ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
+        return ip
+
+
+class MediaFilesMiddleware:
+    """
+    Serve uploaded media without the rest of the middleware stack
+    (the way WhiteNoise serves static files); see media.py
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def requested_media(request):
+        """The media file a GET/HEAD request asks for, else None"""
+        if request.method in ('GET', 'HEAD'):
+            return media_name(request.path)
+        return None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        name = self.requested_media(request)
+        if name is not None:
+            return serve_media(request, name)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        name = self.requested_media(request)
+        if name is not None:
+            # The stat and open are blocking file system calls
+            return await sync_to_async(serve_media, thread_sensitive=False)(request, name)
+        return await self.get_response(request)
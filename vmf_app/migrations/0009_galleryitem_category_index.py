@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0008_contactinfo_contactsubmission'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(fields=['is_active', 'category', 'display_order', '-created_at', '-id'], name='gallery_category_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0009_galleryitem_category_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='galleryitem',
+            name='gallery_category_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aboutsection',
+            index=models.Index(fields=['-is_active', '-updated_at'], name='about_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aboutsection',
+            index=models.Index(fields=['updated_at'], name='about_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactinfo',
+            index=models.Index(fields=['-is_active', '-updated_at'], name='contact_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactinfo',
+            index=models.Index(fields=['updated_at'], name='contact_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', '-created_at', '-id'], name='gallery_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'display_order', '-created_at', '-id'], name='gallery_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['display_order', '-created_at'], name='gallery_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(fields=['updated_at'], name='gallery_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', '-created_at'], name='project_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['updated_at'], name='project_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', 'title'], name='service_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['updated_at'], name='service_updated_idx'),
+        ),
+    ]
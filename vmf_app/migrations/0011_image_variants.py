@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0010_public_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryitem',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated WebP/AVIF derivatives of the uploaded image'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated WebP/AVIF derivatives of the uploaded image'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0011_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryitem',
+            name='thumbnail_source_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the media file the thumbnail was generated from', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='galleryitem',
+            name='thumbnail_file',
+            field=models.ImageField(blank=True, help_text='Card thumbnail (generated from the uploaded image; upload one to override)', null=True, upload_to='gallery/thumbnails/'),
+        ),
+    ]
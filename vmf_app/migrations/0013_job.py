@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0012_galleryitem_thumbnail_source_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(help_text='Registered task name (see vmf_app/tasks.py)', max_length=200)),
+                ('args', models.JSONField(blank=True, default=list, help_text='Positional arguments passed to the task')),
+                ('queue', models.CharField(default='default', help_text='Queue the job runs on (each queue has a concurrency limit)', max_length=50)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', help_text='Job status', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Number of times the job has been started')),
+                ('max_attempts', models.PositiveIntegerField(default=5, help_text='Attempts before the job is marked as failed')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the job may run (pushed back after a failure)')),
+                ('locked_by', models.CharField(blank=True, help_text='Worker running the job', max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, help_text='When the running attempt started', null=True)),
+                ('last_error', models.TextField(blank=True, help_text='Traceback of the last failed attempt')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the job succeeded or ran out of attempts', null=True)),
+            ],
+            options={
+                'verbose_name': 'Background Job',
+                'verbose_name_plural': 'Background Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['run_at', 'id'], name='job_ready_idx'), models.Index(fields=['status', 'queue'], name='job_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0013_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Storage name (cas/<first two hex digits>/<sha256>.<ext>)', max_length=255, unique=True)),
+                ('sha256', models.CharField(help_text='SHA-256 of the file content', max_length=64)),
+                ('size', models.PositiveBigIntegerField(help_text='File size in bytes')),
+                ('refcount', models.PositiveIntegerField(default=1, help_text='Number of saves currently referring to the file')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Media Blob',
+                'verbose_name_plural': 'Media Blobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
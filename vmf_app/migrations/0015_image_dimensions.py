@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vmf_app', '0014_mediablob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryitem',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='Most common colour of the image (#rrggbb), shown while it loads', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='galleryitem',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Height of the image in pixels (upright)', null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryitem',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width of the image in pixels (upright), so pages can reserve its box', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='Most common colour of the image (#rrggbb), shown while it loads', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Height of the image in pixels (upright)', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Width of the image in pixels (upright), so pages can reserve its box', null=True),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
+from .images import DERIVATIVE_WIDTHS, THUMBNAIL_SIZE, image_sources
+from .remote_images import remote_image_url
+
 # Create your models here.
 
 class AboutSection(models.Model):
@@ -64,6 +68,11 @@ class AboutSection(models.Model):
         verbose_name = "About Section"
         verbose_name_plural = "About Sections"
         ordering = ['-updated_at']
+        indexes = [
+            # Active row lookup and the content version stamp
+            models.Index(fields=['-is_active', '-updated_at'], name='about_active_idx'),
+            models.Index(fields=['updated_at'], name='about_updated_idx'),
+        ]
     
     def __str__(self):
         return f"About Section - {self.title}"
@@ -115,6 +124,11 @@ class Service(models.Model):
         verbose_name = "Service"
         verbose_name_plural = "Services"
         ordering = ['display_order', 'title']
+        indexes = [
+            # Homepage service cards
+            models.Index(fields=['display_order', 'title'], condition=Q(is_active=True), name='service_public_idx'),
+            models.Index(fields=['updated_at'], name='service_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -130,6 +144,11 @@ class Service(models.Model):
 class Project(models.Model):
     """Model for managing project showcase"""
     
+    # File field the responsive derivatives are generated from
+    responsive_image_field = 'image_file'
+    # URL field used when there is no upload
+    external_image_field = 'image_url'
+    
     # Project details
     title = models.CharField(
         max_length=200,
@@ -159,6 +178,30 @@ class Project(models.Model):
         null=True,
         help_text="Upload project image directly (recommended)"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Generated WebP/AVIF derivatives of the uploaded image"
+    )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Width of the image in pixels (upright), so pages can reserve its box"
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Height of the image in pixels (upright)"
+    )
+    dominant_color = models.CharField(
+        max_length=7,
+        blank=True,
+        editable=False,
+        help_text="Most common colour of the image (#rrggbb), shown while it loads"
+    )
     
     # Additional details
     client_name = models.CharField(
@@ -206,6 +249,11 @@ class Project(models.Model):
         verbose_name = "Project"
         verbose_name_plural = "Projects"
         ordering = ['display_order', '-created_at']
+        indexes = [
+            # Projects page and homepage featured projects
+            models.Index(fields=['display_order', '-created_at'], condition=Q(is_active=True), name='project_public_idx'),
+            models.Index(fields=['updated_at'], name='project_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -214,7 +262,15 @@ class Project(models.Model):
         """Return uploaded image URL if available, otherwise external URL"""
         if self.image_file:
             return self.image_file.url
-        return self.image_url
+        return remote_image_url(self.image_url, max(DERIVATIVE_WIDTHS))
+    
+    def get_external_image_url(self):
+        """The external image URL when there is no upload, else ''"""
+        return '' if self.image_file else self.image_url
+    
+    def get_image_sources(self):
+        """(MIME type, srcset) pairs for the uploaded image's derivatives"""
+        return image_sources(self.image_variants, self.image_file.storage)
     
     def save(self, *args, **kwargs):
         # Auto-generate slug from title if not provided
@@ -234,6 +290,11 @@ class Project(models.Model):
 class GalleryItem(models.Model):
     """Model for managing gallery images"""
     
+    # File field the responsive derivatives are generated from
+    responsive_image_field = 'media_file'
+    # URL field used when there is no upload
+    external_image_field = 'media_url'
+    
     MEDIA_TYPE_CHOICES = [
         ('image', 'Image'),
         ('video', 'Video'),
@@ -285,6 +346,30 @@ class GalleryItem(models.Model):
         null=True,
         help_text="Upload image file directly (recommended)"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Generated WebP/AVIF derivatives of the uploaded image"
+    )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Width of the image in pixels (upright), so pages can reserve its box"
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Height of the image in pixels (upright)"
+    )
+    dominant_color = models.CharField(
+        max_length=7,
+        blank=True,
+        editable=False,
+        help_text="Most common colour of the image (#rrggbb), shown while it loads"
+    )
     thumbnail_url = models.URLField(
         max_length=500,
         blank=True,
@@ -294,7 +379,13 @@ class GalleryItem(models.Model):
         upload_to='gallery/thumbnails/',
         blank=True,
         null=True,
-        help_text="Upload thumbnail (optional)"
+        help_text="Card thumbnail (generated from the uploaded image; upload one to override)"
+    )
+    thumbnail_source_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 of the media file the thumbnail was generated from"
     )
     
     # Display settings
@@ -319,6 +410,13 @@ class GalleryItem(models.Model):
         verbose_name = "Gallery Item"
         verbose_name_plural = "Gallery Items"
         ordering = ['display_order', '-created_at']
+        indexes = [
+            # Gallery page (keyset pagination), category filter and homepage picks
+            models.Index(fields=['display_order', '-created_at', '-id'], condition=Q(is_active=True), name='gallery_public_idx'),
+            models.Index(fields=['category', 'display_order', '-created_at', '-id'], condition=Q(is_active=True), name='gallery_category_idx'),
+            models.Index(fields=['display_order', '-created_at'], condition=Q(is_active=True, is_featured=True), name='gallery_featured_idx'),
+            models.Index(fields=['updated_at'], name='gallery_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -327,9 +425,32 @@ class GalleryItem(models.Model):
         """Return uploaded image URL if available, otherwise external URL"""
         if self.media_file:
             return self.media_file.url
+        if self.media_type == 'image':
+            return remote_image_url(self.media_url, max(DERIVATIVE_WIDTHS))
         return self.media_url
     
+    def get_external_image_url(self):
+        """The external image URL when there is no upload, else ''"""
+        if self.media_file or self.media_type != 'image':
+            return ''
+        return self.media_url
+    
+    def get_image_sources(self):
+        """(MIME type, srcset) pairs for the uploaded image's derivatives"""
+        return image_sources(self.image_variants, self.media_file.storage)
+    
+    def get_thumbnail_url(self):
+        """Return the card thumbnail if there is one, otherwise the full image"""
+        if self.thumbnail_file:
+            return self.thumbnail_file.url
+        if self.thumbnail_url:
+            return remote_image_url(self.thumbnail_url, THUMBNAIL_SIZE[0])
+        return self.get_image_url()
+    
     def save(self, *args, **kwargs):
+        if self.thumbnail_file and not self.thumbnail_file._committed:
+            # Uploaded in the admin: it takes the place of the generated thumbnail
+            self.thumbnail_source_hash = ''
         super().save(*args, **kwargs)
 
 
@@ -465,6 +586,11 @@ class ContactInfo(models.Model):
         verbose_name = "Contact Information"
         verbose_name_plural = "Contact Information"
         ordering = ['-updated_at']
+        indexes = [
+            # Active row lookup and the content version stamp
+            models.Index(fields=['-is_active', '-updated_at'], name='contact_active_idx'),
+            models.Index(fields=['updated_at'], name='contact_updated_idx'),
+        ]
     
     def __str__(self):
         return f"Contact Info - {self.company_name}"
@@ -571,3 +697,115 @@ class ContactSubmission(models.Model):
         self.status = 'replied'
         self.replied_at = timezone.now()
         self.save()
+
+
+class Job(models.Model):
+    """Background job stored in the database and run by `manage.py run_jobs`"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    # What to run
+    task = models.CharField(
+        max_length=200,
+        help_text="Registered task name (see vmf_app/tasks.py)"
+    )
+    args = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Positional arguments passed to the task"
+    )
+    queue = models.CharField(
+        max_length=50,
+        default='default',
+        help_text="Queue the job runs on (each queue has a concurrency limit)"
+    )
+    
+    # Progress
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='queued',
+        help_text="Job status"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of times the job has been started"
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=5,
+        help_text="Attempts before the job is marked as failed"
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time the job may run (pushed back after a failure)"
+    )
+    locked_by = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Worker running the job"
+    )
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When the running attempt started"
+    )
+    last_error = models.TextField(
+        blank=True,
+        help_text="Traceback of the last failed attempt"
+    )
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When the job succeeded or ran out of attempts"
+    )
+    
+    class Meta:
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            # Worker polling for due jobs and the per-queue running counts
+            models.Index(fields=['run_at', 'id'], condition=Q(status='queued'), name='job_ready_idx'),
+            models.Index(fields=['status', 'queue'], name='job_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task} {self.args} ({self.get_status_display()})"
+
+
+class MediaBlob(models.Model):
+    """Reference count of a file in the content-addressed media storage (see storage.py)"""
+    
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Storage name (cas/<first two hex digits>/<sha256>.<ext>)"
+    )
+    sha256 = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the file content"
+    )
+    size = models.PositiveBigIntegerField(
+        help_text="File size in bytes"
+    )
+    refcount = models.PositiveIntegerField(
+        default=1,
+        help_text="Number of saves currently referring to the file"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Media Blob"
+        verbose_name_plural = "Media Blobs"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
@@ -0,0 +1,58 @@
+"""
+Keyset pagination for VMF listings
+Pages are addressed by an opaque cursor holding the last row's sort key,
+so fetching a page costs the same however deep into the listing it is
+"""
+
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(item):
+    """Encode the (display_order, created_at, id) sort key of an item"""
+    key = [item.display_order, item.created_at.isoformat(), item.pk]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor back into (display_order, created_at, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        display_order, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = parse_datetime(created_at)
+        if created_at is None:
+            raise ValueError(cursor)
+        return int(display_order), created_at, int(pk)
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+
+
+def keyset_page(queryset, cursor=None, page_size=24):
+    """
+    Return (items, next_cursor) for rows after the cursor
+    The queryset is ordered by display_order, -created_at, -id
+    """
+    queryset = queryset.order_by('display_order', '-created_at', '-id')
+    if cursor:
+        display_order, created_at, pk = decode_cursor(cursor)
+        # The leading >= bound lets the database seek straight to the cursor
+        queryset = queryset.filter(display_order__gte=display_order).filter(
+            Q(display_order__gt=display_order)
+            | Q(display_order=display_order, created_at__lt=created_at)
+            | Q(display_order=display_order, created_at=created_at, id__lt=pk)
+        )
+
+    # Fetch one extra row to know whether another page exists
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1])
+    return items, next_cursor
@@ -0,0 +1,314 @@
+"""
+Local caching proxy for remote images
+Projects and gallery items can point at images hosted elsewhere
+(Cloudinary). With VMF_IMAGE_PROXY on, their URLs are rewritten to
+/remote-image/<signed url>/?w=<width>: the original is fetched once,
+and each width is resized and encoded (AVIF/WebP when the browser
+accepts them) into MEDIA_ROOT/remote/ and served from there like any
+other media file. Requests for the same source wait on one lock, so a
+cold cache fetches the original once however many requests arrive, and
+a failed fetch is remembered for a while so requests redirect at once.
+The size of an external image is probed from the start of the file only,
+its colour and placeholder from a tiny copy made by Cloudinary
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.error import URLError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core import signing
+from django.http import Http404, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from PIL import Image, ImageFile, ImageOps, UnidentifiedImageError
+
+from .cloudinary_urls import is_cloudinary, transform_url, width_srcset
+from .images import (
+    COLOR_SAMPLE_SIZE, DERIVATIVE_WIDTHS, ENCODER_OPTIONS, MIME_TYPES, THUMBNAIL_SIZE,
+    available_formats, build_placeholder, dominant_color, upright_size,
+)
+from .media import serve_media
+
+try:
+    import fcntl
+except ImportError:  # Windows: requests are only coalesced within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PROXY_ENABLED = getattr(settings, 'VMF_IMAGE_PROXY', False)
+# Only images on these hosts are proxied
+PROXY_HOSTS = tuple(getattr(settings, 'VMF_IMAGE_PROXY_HOSTS', ('res.cloudinary.com',)))
+PROXY_TIMEOUT = getattr(settings, 'VMF_IMAGE_PROXY_TIMEOUT', 10)
+PROXY_MAX_BYTES = getattr(settings, 'VMF_IMAGE_PROXY_MAX_BYTES', 20 * 1024 * 1024)
+# Seconds a failed source is not tried again (requests are redirected to it)
+PROXY_RETRY_AFTER = getattr(settings, 'VMF_IMAGE_PROXY_RETRY_AFTER', 60)
+# Under MEDIA_ROOT, so cached files are served by media.serve_media
+REMOTE_CACHE_DIR = 'remote'
+SIGNING_SALT = 'vmf_app.remote_images'
+# The size probe reads at most this much of a remote file, in small chunks
+PROBE_MAX_BYTES = 256 * 1024
+PROBE_CHUNK_SIZE = 4096
+# Widths served (requests are rounded up to one), so the cache stays bounded
+PROXY_WIDTHS = tuple(sorted({*DERIVATIVE_WIDTHS, THUMBNAIL_SIZE[0]}))
+
+# One lock per source within the process (fcntl covers other workers)
+_source_locks = {}
+_source_locks_guard = threading.Lock()
+
+
+class RemoteImageError(Exception):
+    """The remote image could not be fetched or decoded"""
+
+
+def is_proxied(url):
+    """Whether an external image URL is served through the proxy"""
+    if not (PROXY_ENABLED and url):
+        return False
+    parts = urlsplit(url)
+    return parts.scheme in ('http', 'https') and parts.netloc in PROXY_HOSTS
+
+
+def remote_image_url(url, width=None):
+    """
+    The URL to deliver an external image at a width: through the proxy
+    when it is on, else resized by Cloudinary, else the URL itself
+    """
+    if not is_proxied(url):
+        return transform_url(url, width=width)
+    token = signing.dumps(url, salt=SIGNING_SALT, compress=True)
+    proxy_url = reverse('vmf_app:remote_image', args=[token])
+    if width:
+        proxy_url += '?' + urlencode({'w': width})
+    return proxy_url
+
+
+def remote_image_srcset(url, max_width=None):
+    """srcset for an external image, or '' when it can only be delivered as is"""
+    if is_proxied(url):
+        widths = [width for width in PROXY_WIDTHS if max_width is None or width <= max_width]
+        return ', '.join(f'{remote_image_url(url, width)} {width}w' for width in widths)
+    if is_cloudinary(url):
+        return width_srcset(url, max_width)
+    return ''
+
+
+def source_url(token):
+    """The external URL a proxy token was signed for, or None if it was tampered with"""
+    try:
+        return signing.loads(token, salt=SIGNING_SALT)
+    except signing.BadSignature:
+        return None
+
+
+def snap_width(value):
+    """The configured width to serve for a requested one (the largest when absent or invalid)"""
+    try:
+        requested = int(value)
+    except (TypeError, ValueError):
+        return PROXY_WIDTHS[-1]
+    # Round up, so the browser never gets less than it asked for
+    return next((width for width in PROXY_WIDTHS if width >= requested), PROXY_WIDTHS[-1])
+
+
+def negotiate_format(accept):
+    """The best format the browser accepts, falling back to JPEG"""
+    for fmt in available_formats():
+        if MIME_TYPES[fmt] in accept:
+            return fmt
+    return 'jpeg'
+
+
+def cache_key(url):
+    """Directory name for one remote source under REMOTE_CACHE_DIR"""
+    return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+
+@contextmanager
+def source_lock(key, directory):
+    """Hold the lock for one source across threads and worker processes"""
+    with _source_locks_guard:
+        lock = _source_locks.setdefault(key, threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with open(directory / '.lock', 'wb') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_atomic(path, content):
+    """Write a file under a temporary name and move it into place"""
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def fetch_source(url):
+    """Download a remote image, refusing anything over PROXY_MAX_BYTES"""
+    request = Request(url, headers={'User-Agent': 'vmf-image-proxy'})
+    try:
+        with urlopen(request, timeout=PROXY_TIMEOUT) as response:
+            content = response.read(PROXY_MAX_BYTES + 1)
+    except (URLError, OSError, ValueError) as error:
+        raise RemoteImageError(f'Cannot fetch {url}: {error}') from error
+    if len(content) > PROXY_MAX_BYTES:
+        raise RemoteImageError(f'{url} is larger than {PROXY_MAX_BYTES} bytes')
+    return content
+
+
+def probe_remote_image(url):
+    """
+    (width, height) of a remote image, parsed from the start of the file
+    The connection is closed as soon as Pillow has read the header
+    """
+    request = Request(url, headers={
+        'User-Agent': 'vmf-image-proxy',
+        # Servers that ignore it are cut off after the header anyway
+        'Range': f'bytes=0-{PROBE_MAX_BYTES - 1}',
+    })
+    parser = ImageFile.Parser()
+    received = 0
+    try:
+        with urlopen(request, timeout=PROXY_TIMEOUT) as response:
+            while parser.image is None and received < PROBE_MAX_BYTES:
+                chunk = response.read(PROBE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                received += len(chunk)
+                parser.feed(chunk)
+    except (URLError, OSError, ValueError) as error:
+        logger.warning('Cannot probe %s: %s', url, error)
+        return None
+    if parser.image is None:
+        logger.warning('No image header in the first %s bytes of %s', received, url)
+        return None
+    return upright_size(parser.image)
+
+
+def remote_image_summary(url):
+    """
+    (width, height, dominant colour, placeholder) of an external image
+    without downloading it: the size comes from the header, the colour
+    and placeholder from a tiny copy when Cloudinary can make one ('' otherwise)
+    """
+    size = probe_remote_image(url)
+    if size is None:
+        return None
+    color = placeholder = ''
+    if is_cloudinary(url):
+        try:
+            content = fetch_source(transform_url(url, width=COLOR_SAMPLE_SIZE))
+            with Image.open(io.BytesIO(content)) as sample:
+                sample = ImageOps.exif_transpose(sample)
+                color = dominant_color(sample)
+                placeholder = build_placeholder(sample.convert('RGBA'))
+        except (RemoteImageError, UnidentifiedImageError, OSError) as error:
+            logger.warning('Cannot sample the colour of %s: %s', url, error)
+    return (*size, color, placeholder)
+
+
+def encode_variant(content, width, fmt):
+    """Resize an image (never upscaling) and encode it in the given format"""
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, OSError) as error:
+        raise RemoteImageError(f'Cannot decode image: {error}') from error
+
+    if fmt == 'jpeg' or image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB' if fmt == 'jpeg' else 'RGBA')
+    if image.width > width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **ENCODER_OPTIONS.get(fmt, {'quality': 80}))
+    return buffer.getvalue()
+
+
+def check_recent_failure(directory):
+    """Raise RemoteImageError if the source failed less than PROXY_RETRY_AFTER seconds ago"""
+    try:
+        failed_at = (directory / 'failed').stat().st_mtime
+    except FileNotFoundError:
+        return
+    if time.time() - failed_at < PROXY_RETRY_AFTER:
+        raise RemoteImageError(f'Source failed recently, retrying after {PROXY_RETRY_AFTER}s')
+
+
+def cached_variant(url, width, fmt):
+    """
+    The MEDIA_ROOT-relative name of a resized copy of a remote image,
+    fetching and encoding it on the first request
+    """
+    key = cache_key(url)
+    extension = 'jpg' if fmt == 'jpeg' else fmt
+    name = f'{REMOTE_CACHE_DIR}/{key}/{width}.{extension}'
+    path = Path(settings.MEDIA_ROOT) / name
+    if path.exists():
+        return name
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A source that is down must not keep requests waiting on the lock and the timeout
+    check_recent_failure(path.parent)
+    with source_lock(key, path.parent):
+        # Made (or given up on) by another request while this one waited
+        if path.exists():
+            return name
+        check_recent_failure(path.parent)
+        source = path.parent / 'source'
+        try:
+            if source.exists():
+                content = source.read_bytes()
+            else:
+                content = fetch_source(url)
+                write_atomic(source, content)
+            write_atomic(path, encode_variant(content, width, fmt))
+        except RemoteImageError:
+            # Not an image: fetch it again once the failure expires
+            source.unlink(missing_ok=True)
+            (path.parent / 'failed').touch()
+            raise
+        (path.parent / 'failed').unlink(missing_ok=True)
+    return name
+
+
+def serve_remote_image(request, token):
+    """Serve the cached copy of a remote image, falling back to the original on errors"""
+    url = source_url(token)
+    if url is None or not is_proxied(url):
+        raise Http404('Unknown remote image')
+
+    try:
+        name = cached_variant(
+            url, snap_width(request.GET.get('w')), negotiate_format(request.headers.get('Accept', ''))
+        )
+    except RemoteImageError as error:
+        # The page still shows the image, straight from its host
+        logger.warning('Remote image proxy: %s', error)
+        return HttpResponseRedirect(url)
+
+    response = serve_media(request, name)
+    patch_vary_headers(response, ['Accept'])
+    return response
@@ -0,0 +1,85 @@
+"""
+Generated service worker for the public VMF pages
+The precache list comes from the hashed names in the collectstatic
+manifest (staticfiles.json), and the worker is rendered once per process
+and served from memory
+"""
+
+import fnmatch
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.loader import render_to_string
+
+from .assets import JS_MANIFEST
+from .cloudinary_urls import CLOUDINARY_HOST
+
+# Never precached: admin assets, and CSS that is only ever inlined
+PRECACHE_EXCLUDE = ('admin/*', 'build/css/*.critical.css', 'build/' + JS_MANIFEST)
+# Sources the build replaces; skipped once the build output exists
+BUILD_SOURCES = {
+    'build/' + JS_MANIFEST: ('js/modules/*',),
+    'build/css/styles.css': ('css/styles.css',),
+}
+IMAGE_CACHE_LIMIT = getattr(settings, 'VMF_SW_IMAGE_CACHE_LIMIT', 120)
+# Cross-origin image hosts that send CORS headers; the worker fetches their
+# images in cors mode so it can check the status before caching them
+CORS_IMAGE_HOSTS = (CLOUDINARY_HOST,)
+
+_service_worker = None
+_service_worker_lock = threading.Lock()
+
+
+class ServiceWorker:
+    """Rendered service worker script and its validator"""
+
+    def __init__(self, content, version):
+        self.content = content
+        self.version = version
+        # From the content, so changes to the script itself reach browsers too
+        self.etag = f'"{hashlib.md5(content).hexdigest()[:12]}"'
+
+
+def precache_paths():
+    """Hashed static paths the pages use, from the collectstatic manifest"""
+    # Only ManifestStaticFilesStorage has hashed_files; DEBUG serves unhashed names
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if settings.DEBUG or not hashed_files:
+        return []
+
+    exclude = list(PRECACHE_EXCLUDE)
+    for built, sources in BUILD_SOURCES.items():
+        if built in hashed_files:
+            exclude.extend(sources)
+
+    return sorted(
+        settings.STATIC_URL + hashed_name
+        for name, hashed_name in hashed_files.items()
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in exclude)
+    )
+
+
+def build_service_worker():
+    """Render the service worker; its version is a hash of the precache list"""
+    paths = precache_paths()
+    version = hashlib.md5(json.dumps(paths).encode('utf-8')).hexdigest()[:12]
+    content = render_to_string('service_worker.js', {
+        'version': version,
+        'precache_urls': json.dumps(paths),
+        'image_cache_limit': IMAGE_CACHE_LIMIT,
+        'cors_image_hosts': json.dumps(CORS_IMAGE_HOSTS),
+    })
+    return ServiceWorker(content.encode('utf-8'), version)
+
+
+def get_service_worker():
+    """Return the service worker for this process, rendering it on first use"""
+    global _service_worker
+    if _service_worker is None:
+        with _service_worker_lock:
+            if _service_worker is None:
+                _service_worker = build_service_worker()
+    return _service_worker
@@ -0,0 +1,92 @@
+"""
+Signal handlers for VMF content models
+Keeps cached public pages in sync with admin edits, queues image
+processing for new uploads and image URLs and releases the stored files
+of replaced uploads and deleted items
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .cache import bump_content_version
+from .images import delete_variants, needs_processing
+from .jobs import enqueue
+from .singletons import SINGLETON_MODELS, bump_singleton_version
+from .tasks import process_uploaded_image
+from .models import AboutSection, Service, Project, GalleryItem, ContactInfo
+
+# Models rendered on the public pages
+PUBLIC_CONTENT_MODELS = (AboutSection, Service, Project, GalleryItem, ContactInfo)
+# File fields whose stored files are released when replaced or deleted
+STORED_FILE_FIELDS = {
+    Project: ('image_file',),
+    GalleryItem: ('media_file', 'thumbnail_file'),
+}
+
+
+def invalidate_public_pages(sender, **kwargs):
+    """Drop cached public pages once the change is committed"""
+    transaction.on_commit(bump_content_version)
+    if sender in SINGLETON_MODELS:
+        transaction.on_commit(lambda: bump_singleton_version(sender))
+
+
+for model in PUBLIC_CONTENT_MODELS:
+    post_save.connect(invalidate_public_pages, sender=model, dispatch_uid=f'vmf_invalidate_save_{model.__name__}')
+    post_delete.connect(invalidate_public_pages, sender=model, dispatch_uid=f'vmf_invalidate_delete_{model.__name__}')
+
+
+def queue_image_processing(sender, instance, **kwargs):
+    """Build derivatives and thumbnails on a worker, not in the admin's request"""
+    if needs_processing(instance):
+        enqueue(process_uploaded_image, sender._meta.label, instance.pk)
+
+
+def remember_stored_files(sender, instance, **kwargs):
+    """Note the file names in the database before a save replaces them"""
+    fields = STORED_FILE_FIELDS[sender]
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first() if instance.pk else None
+    instance._stored_files = previous or {}
+    # Uploads not yet written add a reference even when the content (and so the name) is unchanged
+    instance._uploaded_fields = {field for field in fields if not getattr(instance, field)._committed}
+
+
+def reset_image_dimensions(sender, instance, **kwargs):
+    """Forget the recorded size, colour and external placeholder when the image file or URL changes"""
+    if instance.pk is None or instance.image_width is None:
+        return
+    fields = (sender.responsive_image_field, sender.external_image_field)
+    previous = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    current = (getattr(instance, fields[0]).name or '', getattr(instance, fields[1]))
+    if previous is not None and tuple(value or '' for value in previous) != current:
+        instance.image_width = instance.image_height = None
+        instance.dominant_color = ''
+        if not (previous[0] or current[0]):
+            # Only the placeholder of the previous external image, no derivatives to delete
+            instance.image_variants = {}
+
+
+def release_replaced_files(sender, instance, **kwargs):
+    """Release the files a save replaced or cleared, once it is committed"""
+    for field, name in getattr(instance, '_stored_files', {}).items():
+        field_file = getattr(instance, field)
+        if name and (name != field_file.name or field in instance._uploaded_fields):
+            transaction.on_commit(lambda storage=field_file.storage, name=name: storage.delete(name))
+
+
+def release_deleted_files(sender, instance, **kwargs):
+    """Release an item's uploads and derivatives once the delete is committed"""
+    for field in STORED_FILE_FIELDS[sender]:
+        field_file = getattr(instance, field)
+        if field_file:
+            transaction.on_commit(lambda storage=field_file.storage, name=field_file.name: storage.delete(name))
+    storage = getattr(instance, sender.responsive_image_field).storage
+    transaction.on_commit(lambda: delete_variants(instance.image_variants, storage))
+
+
+for model in STORED_FILE_FIELDS:
+    pre_save.connect(remember_stored_files, sender=model, dispatch_uid=f'vmf_stored_files_{model.__name__}')
+    pre_save.connect(reset_image_dimensions, sender=model, dispatch_uid=f'vmf_image_dimensions_{model.__name__}')
+    post_save.connect(release_replaced_files, sender=model, dispatch_uid=f'vmf_replaced_files_{model.__name__}')
+    post_save.connect(queue_image_processing, sender=model, dispatch_uid=f'vmf_image_processing_{model.__name__}')
+    post_delete.connect(release_deleted_files, sender=model, dispatch_uid=f'vmf_deleted_files_{model.__name__}')
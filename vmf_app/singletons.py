@@ -0,0 +1,58 @@
+"""
+Process-local cache for the singleton content models
+AboutSection and ContactInfo are read on every page, so each worker keeps
+its own copy and only re-reads it when the shared version stamp changes
+"""
+
+import threading
+
+from django.core.cache import cache
+
+from .cache import bump_version, get_version
+from .models import AboutSection, ContactInfo
+
+SINGLETON_MODELS = (AboutSection, ContactInfo)
+
+# model label -> (version stamp, instance)
+_singletons = {}
+_singletons_lock = threading.Lock()
+
+
+def singleton_version_key(model):
+    """Shared cache key holding the version stamp for a singleton model"""
+    return f'vmf:singleton_version:{model._meta.label_lower}'
+
+
+def bump_singleton_version(model):
+    """Tell every worker to drop its copy of a singleton model"""
+    bump_version(singleton_version_key(model))
+
+
+def get_singletons(*models):
+    """
+    Return the active instance of each model, in the order given
+    Falls back to the most recently updated row when none is active
+    """
+    keys = {model: singleton_version_key(model) for model in models}
+    versions = cache.get_many(keys.values())
+
+    instances = []
+    for model in models:
+        key = keys[model]
+        version = versions.get(key) or get_version(key)
+
+        label = model._meta.label_lower
+        cached = _singletons.get(label)
+        if cached is None or cached[0] != version:
+            # Active row first, then the default -updated_at ordering
+            instance = model.objects.order_by('-is_active', *model._meta.ordering).first()
+            with _singletons_lock:
+                _singletons[label] = (version, instance)
+            cached = (version, instance)
+        instances.append(cached[1])
+    return instances
+
+
+def get_singleton(model):
+    """Return the active instance of a single singleton model"""
+    return get_singletons(model)[0]
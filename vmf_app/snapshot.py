@@ -0,0 +1,122 @@
+"""
+Site content snapshot for the public VMF pages
+All public listings are loaded in one pass and kept in process memory
+until the content version changes. The AboutSection and ContactInfo
+singletons are cached separately (see singletons.py)
+"""
+
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Count
+
+from .cache import get_content_version
+from .models import Service, Project, GalleryItem
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+# (event loop, version) -> the abuild() task concurrent async requests share
+_snapshot_builds = {}
+
+
+def snapshot_querysets():
+    """The independent queries a snapshot is built from"""
+    return {
+        # Listings, in the same order the pages display them
+        'services': Service.objects.filter(is_active=True).order_by('display_order', 'title'),
+        # Cards only; the modal loads full_description from the project_detail view
+        'projects': Project.objects.filter(is_active=True).only(
+            'title', 'category', 'short_description', 'image_url', 'image_file',
+            'image_variants', 'image_width', 'image_height', 'dominant_color',
+            'slug', 'is_featured', 'display_order', 'created_at'
+        ).order_by('display_order', '-created_at'),
+        # Only the homepage picks are kept, the gallery page is paginated
+        'featured_gallery': GalleryItem.objects.filter(
+            is_active=True,
+            is_featured=True
+        ).order_by('display_order', '-created_at')[:2],
+        # Gallery category counts in a single GROUP BY
+        'gallery_counts': GalleryItem.objects.filter(is_active=True)
+            .values_list('category')
+            .annotate(total=Count('id'))
+            .order_by(),
+    }
+
+
+def _fetch_in_thread(queryset):
+    """Evaluate a queryset on its own connection and close it afterwards"""
+    try:
+        return list(queryset)
+    finally:
+        # Pool threads never see request_finished, so nothing else closes it
+        connections.close_all()
+
+
+class SiteSnapshot:
+    """Read-only copy of everything the public pages render"""
+
+    def __init__(self, version, services, projects, featured_gallery, gallery_counts):
+        self.version = version
+        self.services = services
+        self.projects = projects
+        self.featured_gallery = featured_gallery
+
+        counts = dict(gallery_counts)
+        self.gallery_total = sum(counts.values())
+        self.gallery_facets = [
+            {'value': value, 'label': label, 'count': counts[value]}
+            for value, label in GalleryItem.CATEGORY_CHOICES
+            if counts.get(value)
+        ]
+
+    @classmethod
+    def build(cls, version):
+        """Load the snapshot with one query after another"""
+        return cls(version, **{name: list(queryset) for name, queryset in snapshot_querysets().items()})
+
+    @classmethod
+    async def abuild(cls, version):
+        """Load the snapshot with all queries running concurrently"""
+        querysets = snapshot_querysets()
+        results = await asyncio.gather(*(
+            sync_to_async(_fetch_in_thread, thread_sensitive=False)(queryset)
+            for queryset in querysets.values()
+        ))
+        return cls(version, **dict(zip(querysets, results)))
+
+    @property
+    def featured_projects(self):
+        """Top 3 featured projects for the homepage"""
+        return [project for project in self.projects if project.is_featured][:3]
+
+
+def get_site_snapshot():
+    """Return the snapshot for the current content version, rebuilding if stale"""
+    global _snapshot
+    version = get_content_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = SiteSnapshot.build(version)
+            snapshot = _snapshot
+    return snapshot
+
+
+async def aget_site_snapshot():
+    """Async get_site_snapshot(); a stale snapshot is rebuilt concurrently, once per version"""
+    global _snapshot
+    version = await sync_to_async(get_content_version)()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        key = (asyncio.get_running_loop(), version)
+        build = _snapshot_builds.get(key)
+        if build is None:
+            build = _snapshot_builds[key] = asyncio.ensure_future(SiteSnapshot.abuild(version))
+            build.add_done_callback(lambda _: _snapshot_builds.pop(key, None))
+        # A request that goes away must not cancel the build the others wait on
+        snapshot = await asyncio.shield(build)
+        _snapshot = snapshot
+    return snapshot
@@ -0,0 +1,79 @@
+"""
+Content-addressed media storage
+Uploads are named by the SHA-256 of their content, so the same photo
+uploaded for a project and a gallery item is stored once. Every save adds
+a reference (MediaBlob.refcount) and every delete removes one; the file
+goes when the last reference does. Names never change content, so they
+are served as immutable (see media.py)
+"""
+
+import hashlib
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+CAS_PREFIX = 'cas'
+
+
+def content_name(digest, original_name):
+    """Storage name for content with the given SHA-256, keeping the extension"""
+    extension = posixpath.splitext(original_name)[1].lower()
+    return f'{CAS_PREFIX}/{digest[:2]}/{digest}{extension}'
+
+
+def is_content_name(name):
+    """Whether a storage name was given by ContentAddressedStorage"""
+    return name.startswith(f'{CAS_PREFIX}/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that deduplicates by content hash and counts references"""
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in content.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        name = content_name(digest.hexdigest(), name)
+
+        if not self.exists(name):
+            saved = super()._save(name, content)
+            if saved != name:
+                # Another request wrote the same content first; keep one copy
+                super().delete(saved)
+        self._add_reference(name, digest.hexdigest(), size)
+        return name
+
+    def _add_reference(self, name, digest, size):
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            if not MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1):
+                MediaBlob.objects.create(name=name, sha256=digest, size=size)
+
+    def delete(self, name):
+        """Drop one reference; the file is removed with the last one"""
+        from .models import MediaBlob
+
+        if not name:
+            return
+        if not is_content_name(name):
+            # Stored before content addressing, not shared
+            return super().delete(name)
+
+        with transaction.atomic():
+            blob = MediaBlob.objects.filter(name=name).first()
+            if blob is not None and blob.refcount > 1:
+                MediaBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') - 1)
+                return
+            if blob is not None:
+                blob.delete()
+
+        def remove_unreferenced():
+            # The same content may have been saved again in the meantime
+            if not MediaBlob.objects.filter(name=name).exists():
+                FileSystemStorage.delete(self, name)
+        transaction.on_commit(remove_unreferenced)
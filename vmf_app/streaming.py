@@ -0,0 +1,82 @@
+"""
+Streamed rendering for the long public listing pages
+The document head and navigation are sent before any content is loaded,
+so the browser can fetch styles, fonts and scripts while the page intro,
+the item grid (in chunks) and the footer are still being rendered
+"""
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# Emitted by page templates where the streamed parts are joined
+STREAM_BREAK = mark_safe('<!-- vmf:stream-break -->')
+STREAM_CHUNK_SIZE = getattr(settings, 'VMF_STREAM_CHUNK_SIZE', 12)
+
+
+def streaming_enabled():
+    """Whether the listing pages are sent as streamed responses"""
+    return getattr(settings, 'VMF_STREAM_PAGES', False)
+
+
+class StreamedPage:
+    """
+    A page template split into head, intro, item chunks and tail
+    The page template skips its head include and prints stream_break in
+    place of the item grid when stream_break is set
+    """
+
+    def __init__(self, head_template, template_name, items_key, item_template, last_chunk_keys=()):
+        self.head_template = head_template
+        self.template_name = template_name
+        self.items_key = items_key
+        self.item_template = item_template
+        # Context keys only passed with the final chunk (e.g. the next page link)
+        self.last_chunk_keys = last_chunk_keys
+
+    def head(self, request):
+        """Render the part of the page that needs no content"""
+        return render_to_string(self.head_template, request=request)
+
+    def parts(self, request, context):
+        """Yield the rest of the page, the item grid in chunks"""
+        page = render_to_string(self.template_name, {**context, 'stream_break': STREAM_BREAK}, request)
+        intro, _, tail = page.partition(STREAM_BREAK)
+        yield intro
+
+        items = list(context[self.items_key])
+        for start in range(0, len(items), STREAM_CHUNK_SIZE):
+            chunk_context = {**context, self.items_key: items[start:start + STREAM_CHUNK_SIZE]}
+            if start + STREAM_CHUNK_SIZE < len(items):
+                chunk_context.update(dict.fromkeys(self.last_chunk_keys))
+            yield render_to_string(self.item_template, chunk_context, request)
+
+        yield tail
+
+
+def stream_page(request, page, load_context):
+    """
+    Return a StreamingHttpResponse for a StreamedPage
+    load_context is an async callable taking the request. Under ASGI the
+    response streams asynchronously, under WSGI it is a plain generator
+    """
+    if isinstance(request, ASGIRequest):
+        async def content():
+            yield await sync_to_async(page.head)(request)
+            context = await load_context(request)
+            parts = page.parts(request, context)
+            # Templates may touch the ORM, so each chunk renders off the event loop
+            while (part := await sync_to_async(next)(parts, None)) is not None:
+                yield part
+    else:
+        def content():
+            yield page.head(request)
+            yield from page.parts(request, async_to_sync(load_context)(request))
+
+    response = StreamingHttpResponse(content(), content_type='text/html; charset=utf-8')
+    # Keep nginx from buffering the response, which would undo the early flush
+    response['X-Accel-Buffering'] = 'no'
+    return response
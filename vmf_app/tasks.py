@@ -0,0 +1,28 @@
+"""
+Background tasks for the VMF site
+Queued with jobs.enqueue() and run by `manage.py run_jobs`
+"""
+
+from django.apps import apps
+
+from .cache import bump_content_version
+from .images import refresh_dimensions, refresh_thumbnail, refresh_variants
+from .jobs import task
+
+
+@task(queue='images', max_attempts=3)
+def process_uploaded_image(model_label, pk):
+    """Build the responsive derivatives (and gallery thumbnail) of a saved item and record its image size"""
+    model = apps.get_model(model_label)
+    item = model.objects.filter(pk=pk).first()
+    if item is None:
+        # Deleted before the worker got to it
+        return
+
+    changed = refresh_variants(item)
+    changed = refresh_dimensions(item) or changed
+    if hasattr(item, 'thumbnail_source_hash'):
+        changed = refresh_thumbnail(item) or changed
+    if changed:
+        # Pages cached since the save still point at the original image
+        bump_content_version()
@@ -0,0 +1,60 @@
+"""
+Template tags for the generated front-end assets
+Each tag falls back to the plain source files when the build steps
+(`manage.py build_critical_css` / `build_js_bundles`) have not been run
+"""
+
+import json
+
+from functools import lru_cache
+from pathlib import Path
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from vmf_app.assets import JS_MANIFEST, page_modules
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def _read_asset(path, mtime):
+    """Read a build file; the mtime key drops stale copies after a rebuild"""
+    return Path(path).read_text(encoding='utf-8')
+
+
+def read_build_file(name):
+    """Return the contents of a generated static file, or None if missing"""
+    path = finders.find(f'build/{name}')
+    if path is None:
+        return None
+    return _read_asset(path, Path(path).stat().st_mtime_ns)
+
+
+@register.simple_tag
+def critical_css(page):
+    """Inline the page's above-the-fold CSS and load the rest without blocking render"""
+    critical = read_build_file(f'css/{page}.critical.css')
+    if critical is None:
+        return format_html('<link rel="stylesheet" href="{}">', static('css/styles.css'))
+
+    href = static('build/css/styles.css')
+    return format_html(
+        '<style>{}</style>\n'
+        '    <link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        '    <noscript><link rel="stylesheet" href="{}"></noscript>',
+        mark_safe(critical), href, href,
+    )
+
+
+@register.simple_tag
+def page_scripts(page):
+    """Deferred script tags for the bundles a page uses"""
+    manifest = read_build_file(JS_MANIFEST)
+    paths = json.loads(manifest)[page] if manifest else page_modules(page)
+    return format_html_join(
+        '\n    ', '<script src="{}" defer></script>', ((static(path),) for path in paths)
+    )
@@ -0,0 +1,106 @@
+"""
+Template tags for the responsive image derivatives
+External images get a srcset from Cloudinary transformations (or the
+image proxy); other items without generated derivatives (videos, images
+uploaded before the pipeline) render as a plain <img>. Images carry
+their recorded width/height, and their dominant colour and inline
+placeholder as the <img> background
+"""
+
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from vmf_app.cloudinary_urls import dpr_srcset, transform_url
+from vmf_app.images import THUMBNAIL_SIZE, generated_thumbnail
+from vmf_app.remote_images import remote_image_srcset
+
+register = template.Library()
+
+
+def placeholder_style(item):
+    """style attribute painting the item's colour and placeholder until its image covers it"""
+    placeholder = (item.image_variants or {}).get('placeholder')
+    color = getattr(item, 'dominant_color', '')
+    if placeholder:
+        return format_html(
+            ' style="background: {}url({}) center / cover no-repeat"', f'{color} ' if color else '', placeholder,
+        )
+    if color:
+        return format_html(' style="background-color: {}"', color)
+    return ''
+
+
+def image_dimensions(item):
+    """width/height attributes, so the browser reserves the box before the image loads"""
+    metadata = item.image_variants or {}
+    width = getattr(item, 'image_width', None) or metadata.get('width')
+    height = getattr(item, 'image_height', None) or metadata.get('height')
+    if not (width and height):
+        return ''
+    return format_html(' width="{}" height="{}"', width, height)
+
+
+@register.simple_tag
+def responsive_image(item, css_class, sizes='100vw', alt=None):
+    """A <picture> with AVIF/WebP srcsets for an item that has get_image_url()"""
+    sources = item.get_image_sources()
+    srcset = '' if sources else remote_image_srcset(item.get_external_image_url())
+    if srcset:
+        srcset = format_html(' srcset="{}" sizes="{}"', srcset, sizes)
+
+    img = format_html(
+        '<img src="{}" alt="{}" class="{}"{}{}{} loading="lazy" decoding="async">',
+        item.get_image_url(), item.title if alt is None else alt, css_class,
+        srcset, image_dimensions(item), placeholder_style(item),
+    )
+    if not sources:
+        return img
+
+    return format_html(
+        '<picture>{}{}</picture>',
+        format_html_join(
+            '', '<source type="{}" srcset="{}" sizes="{}">',
+            ((mime_type, srcset, sizes) for mime_type, srcset in sources),
+        ),
+        img,
+    )
+
+
+@register.simple_tag
+def gallery_thumbnail(item, css_class, sizes='100vw'):
+    """A gallery card image: the cropped thumbnail, else the responsive original"""
+    if not (item.thumbnail_file or item.thumbnail_url):
+        return responsive_image(item, css_class, sizes)
+
+    # The size of a thumbnail given by URL or uploaded by hand is not known
+    attributes = ''
+    if generated_thumbnail(item):
+        attributes = format_html(' width="{}" height="{}"', *THUMBNAIL_SIZE)
+    elif not item.thumbnail_file:
+        srcset = remote_image_srcset(item.thumbnail_url, THUMBNAIL_SIZE[0])
+        if srcset:
+            attributes = format_html(' srcset="{}" sizes="{}"', srcset, sizes)
+    return format_html(
+        '<img src="{}" alt="{}" class="{}"{}{} loading="lazy" decoding="async">',
+        item.get_thumbnail_url(), item.title, css_class, attributes, placeholder_style(item),
+    )
+
+
+@register.simple_tag
+def cloudinary_image(url, alt, css_class='', width=None, height=None, title=None, lazy=True):
+    """
+    An <img> for a fixed-size Cloudinary image (logos): delivered at the
+    displayed size, with a 2x variant for high density screens
+    """
+    attributes = format_html(' class="{}"', css_class) if css_class else ''
+    if title:
+        attributes += format_html(' title="{}"', title)
+    if lazy:
+        attributes += format_html(' loading="lazy" decoding="async"')
+    src = transform_url(url, width=width, height=height)
+    if src == url:
+        # Not a Cloudinary upload (or transformations are off)
+        return format_html('<img src="{}" alt="{}"{}>', url, alt, attributes)
+    return format_html(
+        '<img src="{}" srcset="{}" alt="{}"{}>', src, dpr_srcset(url, width=width, height=height), alt, attributes,
+    )
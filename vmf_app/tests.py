@@ -1,3 +1,528 @@
-from django.test import TestCase
+import asyncio
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from PIL import Image
+
+from vmf_app import jobs, media, remote_images, snapshot
+from vmf_app.media import parse_range, serve_media
+from vmf_app.management.commands import prerender_site
+from vmf_app.models import GalleryItem, Job, MediaBlob, Project, Service
+from vmf_app.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+from vmf_app.service_worker import build_service_worker
+from vmf_app.storage import ContentAddressedStorage, content_name
+
+
+def jpeg_bytes(size=(2000, 1000)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class IsolatedSettingsMixin:
+    """Per-test temporary directories for settings and module patches, undone on cleanup"""
+
+    def temporary_directory(self, setting='MEDIA_ROOT'):
+        """Point a directory setting at a new empty directory and return its path"""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        settings_override = override_settings(**{setting: path})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return path
+
+    def patch(self, target, **attributes):
+        """Replace module attributes (e.g. settings read at import) for one test"""
+        patcher = mock.patch.multiple(target, **attributes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class StandInImageHandler(BaseHTTPRequestHandler):
+    """Local stand-in for Cloudinary: serves a JPEG, slowly, and counts requests"""
+
+    image = jpeg_bytes()
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        # Slow enough for concurrent requests to overlap
+        time.sleep(0.2)
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = b'not an image' if self.path.startswith('/text') else self.image
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RemoteImageProxyTests(IsolatedSettingsMixin, SimpleTestCase):
+    """The caching proxy against a local HTTP server"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInImageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.host = f'127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StandInImageHandler.requests.clear()
+        self.temporary_directory()
+        self.patch(remote_images, PROXY_ENABLED=True, PROXY_HOSTS=(self.host,))
+
+    def get(self, url, width, accept='image/webp,*/*'):
+        return self.client.get(remote_images.remote_image_url(url, width), headers={'Accept': accept})
+
+    def test_cold_fetch_resizes_and_caches(self):
+        url = f'http://{self.host}/photo.jpg'
+        response = self.get(url, 800)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('Accept', response['Vary'])
+        with Image.open(io.BytesIO(b''.join(response.streaming_content))) as image:
+            self.assertEqual(image.size, (800, 400))
+
+        # Other widths and formats are made from the stored original
+        self.assertEqual(self.get(url, 480, accept='*/*')['Content-Type'], 'image/jpeg')
+        self.assertEqual(self.get(url, 800).status_code, 200)
+        self.assertEqual(StandInImageHandler.requests, ['/photo.jpg'])
+
+    def test_concurrent_requests_fetch_once(self):
+        url = f'http://{self.host}/shared.jpg'
+        names = []
+        threads = [
+            threading.Thread(target=lambda: names.append(remote_images.cached_variant(url, 800, 'webp')))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(names)), 1)
+        self.assertEqual(len(names), 6)
+        self.assertEqual(StandInImageHandler.requests, ['/shared.jpg'])
+
+    def test_failures_redirect_and_are_remembered(self):
+        for path in ('/missing.jpg', '/text.jpg'):
+            url = f'http://{self.host}{path}'
+            response = self.get(url, 800)
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(response['Location'], url)
+            # Redirected straight away while the failure is fresh
+            self.assertEqual(self.get(url, 480).status_code, 302)
+            self.assertEqual(StandInImageHandler.requests.count(path), 1)
+
+        with mock.patch.object(remote_images, 'PROXY_RETRY_AFTER', 0):
+            self.get(f'http://{self.host}/missing.jpg', 800)
+        self.assertEqual(StandInImageHandler.requests.count('/missing.jpg'), 2)
+
+    def test_tampered_and_unlisted_urls(self):
+        proxy_url = remote_images.remote_image_url(f'http://{self.host}/photo.jpg', 800)
+        self.assertEqual(self.client.get(proxy_url.replace('/?', 'x/?')).status_code, 404)
+        self.assertEqual(remote_images.remote_image_url('https://example.com/a.jpg'), 'https://example.com/a.jpg')
+
+    def test_summary_samples_colour_and_placeholder(self):
+        url = f'http://{self.host}/photo.jpg'
+        # The stand-in plays Cloudinary, sending the same file for the tiny copy
+        with mock.patch.object(remote_images, 'is_cloudinary', return_value=True):
+            width, height, color, placeholder = remote_images.remote_image_summary(url)
+        self.assertEqual((width, height), (2000, 1000))
+        self.assertRegex(color, r'^#[0-9a-f]{6}$')
+        self.assertTrue(placeholder.startswith('data:image/'))
+
+        # Other hosts cannot make a tiny copy, so only the size is known
+        self.assertEqual(remote_images.remote_image_summary(url)[2:], ('', ''))
+
+
+class SiteSnapshotTests(SimpleTestCase):
+    """Rebuilding the in-process snapshot of the public pages"""
+
+    def test_concurrent_async_requests_build_once(self):
+        builds = []
+
+        async def abuild(version):
+            builds.append(version)
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(version=version)
+
+        async def requests():
+            return await asyncio.gather(*(snapshot.aget_site_snapshot() for _ in range(5)))
+
+        with mock.patch.object(snapshot, '_snapshot', None), \
+                mock.patch.object(snapshot.SiteSnapshot, 'abuild', abuild):
+            results = asyncio.run(requests())
+            self.assertEqual(len(builds), 1)
+            self.assertTrue(all(result is results[0] for result in results))
+            # Up to date: served without another build
+            asyncio.run(requests())
+            self.assertEqual(len(builds), 1)
+        self.assertEqual(snapshot._snapshot_builds, {})
+
+
+class KeysetPaginationTests(TestCase):
+    """Gallery cursors and the pages they address"""
+
+    def test_cursor_round_trip(self):
+        created_at = timezone.now()
+        cursor = encode_cursor(GalleryItem(pk=42, display_order=3, created_at=created_at))
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), (3, created_at, 42))
+
+    def test_invalid_cursors(self):
+        def encoded(value):
+            return base64.urlsafe_b64encode(value.encode()).decode()
+
+        for cursor in (
+            'zzz', '!!!!', 'é', encoded('not json'), encoded('[1, 2]'), encoded('{"a": 1}'),
+            encoded('["x", "2024-01-01T00:00:00", 1]'), encoded('[1, "yesterday", 1]'),
+            encoded('[1, "2024-13-45T00:00:00", 1]'), encoded('[1, 5, 1]'),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_pages_cover_ties_without_gaps_or_repeats(self):
+        # bulk_create skips the save signals, which would queue image jobs
+        GalleryItem.objects.bulk_create(
+            GalleryItem(title=f'G{i}', description='d', media_url='https://example.com/a.jpg', display_order=i % 3)
+            for i in range(10)
+        )
+        # Equal timestamps leave the id to break ties
+        GalleryItem.objects.filter(display_order=1).update(created_at=timezone.now())
+
+        seen = []
+        cursor = None
+        while True:
+            items, cursor = keyset_page(GalleryItem.objects.all(), cursor, page_size=3)
+            seen += items
+            if cursor is None:
+                break
+        expected = list(GalleryItem.objects.order_by('display_order', '-created_at', '-id'))
+        self.assertEqual(seen, expected)
+        self.assertEqual(keyset_page(GalleryItem.objects.all(), page_size=10)[1], None)
+
+
+class MediaRangeTests(IsolatedSettingsMixin, SimpleTestCase):
+    """Byte-range requests for uploaded media served by Django"""
+
+    body = bytes(range(256)) * 4
+
+    def setUp(self):
+        with open(os.path.join(self.temporary_directory(), 'clip.mp4'), 'wb') as handle:
+            handle.write(self.body)
+        self.patch(media, MEDIA_SENDFILE='')
+
+    def get(self, **headers):
+        return serve_media(RequestFactory().get('/media/clip.mp4', headers=headers), 'clip.mp4')
+
+    def test_parse_range(self):
+        cases = {
+            'bytes=0-99': [(0, 99)],
+            'bytes=1000-': [(1000, 1023)],
+            'bytes=1000-5000': [(1000, 1023)],
+            # Suffix ranges count back from the end
+            'bytes=-100': [(924, 1023)],
+            'bytes=-5000': [(0, 1023)],
+            # Overlapping and adjacent ranges are merged, in order
+            'bytes=500-599, 0-99, 50-149, 150-199': [(0, 199), (500, 599)],
+            # Unsatisfiable
+            'bytes=1024-': [],
+            'bytes=-0': [],
+            # Malformed, or too many ranges: the whole file
+            'items=0-99': None,
+            'bytes=': None,
+            'bytes=-': None,
+            'bytes=99-0': None,
+            'bytes=a-b': None,
+            'bytes=' + ','.join(f'{i * 10}-{i * 10 + 1}' for i in range(media.MAX_RANGES + 1)): None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, len(self.body)), expected)
+
+    def test_single_range(self):
+        response = self.get(range='bytes=-100')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 924-1023/1024')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.body[-100:])
+
+    def test_multiple_ranges(self):
+        response = self.get(range='bytes=0-9,100-109')
+        self.assertEqual(response.status_code, 206)
+        content_type, _, boundary = response['Content-Type'].partition('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+        content = b''.join(response.streaming_content)
+        self.assertEqual(len(content), int(response['Content-Length']))
+        self.assertIn(b'Content-Range: bytes 0-9/1024\r\n\r\n' + self.body[:10], content)
+        self.assertIn(b'Content-Range: bytes 100-109/1024\r\n\r\n' + self.body[100:110], content)
+        self.assertTrue(content.endswith(f'--{boundary}--\r\n'.encode()))
+
+    def test_unsatisfiable_range(self):
+        response = self.get(range='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_range(self):
+        response = self.get()
+        response.close()
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.get(range='bytes=0-9', if_range=etag).status_code, 206)
+        self.assertEqual(self.get(range='bytes=0-9', if_range=last_modified).status_code, 206)
+        # The file changed (or a weak tag was sent): the whole file instead
+        for if_range in ('"stale"', f'W/{etag}', http_date(0)):
+            with self.subTest(if_range=if_range):
+                response = self.get(range='bytes=0-9', if_range=if_range)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(b''.join(response.streaming_content), self.body)
+                response.close()
+
+
+@override_settings(VMF_RUN_JOBS_INLINE=False)
+class ContentAddressedStorageTests(IsolatedSettingsMixin, TestCase):
+    """Reference counts of deduplicated uploads"""
+
+    def setUp(self):
+        self.temporary_directory()
+        self.storage = ContentAddressedStorage()
+
+    def refcount(self, name):
+        blob = MediaBlob.objects.filter(name=name).first()
+        return blob.refcount if blob else 0
+
+    def test_same_content_is_stored_once(self):
+        first = self.storage.save('projects/a.JPG', ContentFile(b'same'))
+        second = self.storage.save('gallery/b.jpg', ContentFile(b'same'))
+        self.assertEqual(first, second)
+        self.assertEqual(first, content_name(hashlib.sha256(b'same').hexdigest(), 'a.jpg'))
+        self.assertEqual(self.refcount(first), 2)
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(first))), [os.path.basename(first)])
+
+    def test_file_goes_with_the_last_reference(self):
+        name = self.storage.save('a.jpg', ContentFile(b'shared'))
+        self.storage.save('b.jpg', ContentFile(b'shared'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+        self.assertEqual(self.refcount(name), 1)
+        self.assertTrue(self.storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+        self.assertEqual(self.refcount(name), 0)
+        self.assertFalse(self.storage.exists(name))
+
+    def test_saved_again_before_the_commit(self):
+        name = self.storage.save('a.jpg', ContentFile(b'again'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+            self.storage.save('b.jpg', ContentFile(b'again'))
+        self.assertEqual(self.refcount(name), 1)
+        self.assertTrue(self.storage.exists(name))
+
+    def test_model_replace_and_delete(self):
+        project = Project(title='P', category='c', short_description='s', full_description='f')
+        project.image_file = ContentFile(b'first', name='first.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        first = project.image_file.name
+
+        # The same content uploaded again keeps a single reference
+        project.image_file = ContentFile(b'first', name='again.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertEqual(project.image_file.name, first)
+        self.assertEqual(self.refcount(first), 1)
+
+        project.image_file = ContentFile(b'second', name='second.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        second = project.image_file.name
+        self.assertEqual((self.refcount(first), self.refcount(second)), (0, 1))
+        self.assertFalse(self.storage.exists(first))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(self.storage.exists(second))
+
+
+@override_settings(VMF_RUN_JOBS_INLINE=False)
+class PrerenderSiteTests(IsolatedSettingsMixin, TestCase):
+    """Which pages an incremental prerender_site run rebuilds"""
+
+    def setUp(self):
+        self.root = self.temporary_directory('VMF_PRERENDER_ROOT')
+        for title in ('Gate', 'Shed'):
+            Project.objects.create(title=title, category='c', short_description='s', full_description='f')
+
+    def rendered(self):
+        outputs = []
+
+        def render_page(job):
+            output = job[2]
+            outputs.append(output)
+            with open(os.path.join(self.root, output.replace('/', os.sep)), 'wb'):
+                pass
+            return output
+
+        os.makedirs(os.path.join(self.root, 'projects'), exist_ok=True)
+        with mock.patch.object(prerender_site, 'render_page', render_page):
+            call_command('prerender_site', workers=1, stdout=io.StringIO())
+        return sorted(outputs)
+
+    def test_unrelated_save_leaves_project_files_alone(self):
+        self.assertEqual(self.rendered(), [
+            'index.html', 'projects/gate.json', 'projects/index.html', 'projects/shed.json',
+        ])
+        self.assertEqual(self.rendered(), [])
+
+        # The services are only on the homepage
+        Service.objects.create(title='Welding', icon='fa-fire', description='d')
+        self.assertEqual(self.rendered(), ['index.html'])
+
+    def test_image_metadata_rebuilds_its_project(self):
+        self.rendered()
+        # Image jobs write with update(), which leaves updated_at alone
+        Project.objects.filter(slug='gate').update(image_width=800, image_height=600)
+        self.assertEqual(self.rendered(), ['index.html', 'projects/gate.json', 'projects/index.html'])
+
+
+class PageValidatorTests(TestCase):
+    """ETag and Last-Modified on the public pages"""
+
+    def test_error_responses_get_no_validators(self):
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.get('/gallery/items/?after=zzz')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        response = self.client.get('/gallery/items/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/gallery/items/', headers={'If-None-Match': etag}).status_code, 304)
+
+
+calls = []
+
+
+@jobs.task(max_attempts=2)
+def record_call(value):
+    calls.append(value)
+
+
+@jobs.task(max_attempts=2)
+def always_fail():
+    raise RuntimeError('boom')
+
+
+@override_settings(VMF_RUN_JOBS_INLINE=False)
+class JobQueueTests(TestCase):
+    """Database-backed jobs: dedupe, retries, queue limits and stale workers"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_reuses_a_waiting_job(self):
+        job = jobs.enqueue(record_call, 1)
+        self.assertEqual(jobs.enqueue(record_call, 1), job)
+        self.assertNotEqual(jobs.enqueue(record_call, 2), job)
+        # Once running, a new change needs a new run
+        jobs.claim_job('w')
+        self.assertNotEqual(jobs.enqueue(record_call, 1), job)
+        self.assertEqual(Job.objects.filter(args=[1]).count(), 2)
+
+    def test_failures_back_off_then_fail(self):
+        job = jobs.enqueue(always_fail)
+        with self.assertLogs('vmf_app.jobs', 'ERROR'):
+            self.assertFalse(jobs.run_job(jobs.claim_job('w')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        delay = (job.run_at - timezone.now()).total_seconds()
+        self.assertTrue(0.8 * jobs.RETRY_BASE_DELAY - 1 <= delay <= 1.2 * jobs.RETRY_BASE_DELAY)
+        # Not due yet
+        self.assertIsNone(jobs.claim_job('w'))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('vmf_app.jobs', 'ERROR'):
+            jobs.run_job(jobs.claim_job('w'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIn('RuntimeError: boom', job.last_error)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        with mock.patch('random.uniform', return_value=1):
+            self.assertEqual(
+                [jobs.retry_delay(attempts) for attempts in (1, 2, 3)],
+                [jobs.RETRY_BASE_DELAY, 2 * jobs.RETRY_BASE_DELAY, 4 * jobs.RETRY_BASE_DELAY],
+            )
+            self.assertEqual(jobs.retry_delay(30), jobs.RETRY_MAX_DELAY)
+
+    def test_queue_limit(self):
+        jobs.enqueue(record_call, 1)
+        jobs.enqueue(record_call, 2)
+        with mock.patch.object(jobs, 'QUEUE_LIMITS', {'default': 1}):
+            self.assertIsNotNone(jobs.claim_job('w1'))
+            self.assertIsNone(jobs.claim_job('w2'))
+
+    def test_stale_jobs_are_requeued_or_failed(self):
+        stale = timezone.now() - timedelta(seconds=jobs.JOB_TIMEOUT + 1)
+        retried = jobs.enqueue(record_call, 1)
+        exhausted = jobs.enqueue(record_call, 2)
+        Job.objects.update(status='running', locked_by='dead', locked_at=stale, attempts=1)
+        Job.objects.filter(pk=exhausted.pk).update(attempts=2)
+
+        with mock.patch.object(jobs, 'QUEUE_LIMITS', {'default': 1}):
+            # The stale rows fill the queue until the worker's periodic check
+            self.assertIsNone(jobs.claim_job('w'))
+            jobs.Worker(drain=True)._loop('w')
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual((retried.status, retried.attempts), ('done', 2))
+        self.assertEqual(exhausted.status, 'failed')
+        self.assertIn('worker probably died', exhausted.last_error)
+        self.assertEqual(calls, [1])
+
+
+class ServiceWorkerTests(SimpleTestCase):
+    """The generated service worker script"""
+
+    def test_images_are_fetched_so_they_can_be_checked(self):
+        content = build_service_worker().content.decode()
+        self.assertIn('const CORS_IMAGE_HOSTS = ["res.cloudinary.com"];', content)
+        self.assertIn("mode: 'cors'", content)
+        self.assertNotIn("'opaque'", content)
+
+    def test_etag_follows_the_script(self):
+        worker = build_service_worker()
+        with mock.patch('vmf_app.service_worker.render_to_string', return_value='// changed'):
+            changed = build_service_worker()
+        self.assertEqual(changed.version, worker.version)
+        self.assertNotEqual(changed.etag, worker.etag)
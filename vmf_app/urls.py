@@ -6,7 +6,11 @@ app_name = 'vmf_app'
 urlpatterns = [
     path('', views.index, name='index'),
     path('gallery/', views.gallery, name='gallery'),
+    path('gallery/items/', views.gallery_items, name='gallery_items'),
     path('projects/', views.projects, name='projects'),
+    path('projects/<slug:slug>.json', views.project_detail, name='project_detail'),
+    path('remote-image/<str:token>/', views.remote_image, name='remote_image'),
+    path('contact/token/', views.contact_token, name='contact_token'),
     path('contact/submit/', views.contact_submit, name='contact_submit'),
     path('contact/ajax/', views.contact_submit_ajax, name='contact_submit_ajax'),
 ]
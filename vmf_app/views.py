@@ -1,78 +1,181 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
-from django.http import JsonResponse
+from django.db import connections
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+import asyncio
 import json
+from asgiref.sync import sync_to_async
+from .cache import cache_public_page, conditional_public_page
+from .pagination import InvalidCursor, keyset_page
+from .remote_images import serve_remote_image
+from .service_worker import get_service_worker
+from .singletons import get_singletons
+from .snapshot import aget_site_snapshot
+from .streaming import StreamedPage, stream_page, streaming_enabled
 from .models import AboutSection, Service, Project, GalleryItem, ContactInfo, ContactSubmission
 
+GALLERY_PAGE_SIZE = getattr(settings, 'VMF_GALLERY_PAGE_SIZE', 24)
+
 # Create your views here.
 
-def index(request):
+async def _page_content():
+    """Load the site snapshot and the singletons concurrently"""
+    snapshot, (about_section, contact_info) = await asyncio.gather(
+        aget_site_snapshot(),
+        sync_to_async(get_singletons)(AboutSection, ContactInfo),
+    )
+    return snapshot, {'about_section': about_section, 'contact_info': contact_info}
+
+@conditional_public_page(AboutSection, Service, Project, GalleryItem, ContactInfo)
+@cache_public_page
+async def index(request):
     """Main homepage view"""
-    # Get the active About section, or use first one if none active
-    about_section = AboutSection.objects.filter(is_active=True).first()
-    if not about_section:
-        about_section = AboutSection.objects.first()
-    
-    # Get all active services, ordered by display_order
-    services = Service.objects.filter(is_active=True).order_by('display_order', 'title')
-    
-    # Get top 3 featured projects for homepage
-    featured_projects = Project.objects.filter(
-        is_active=True, 
-        is_featured=True
-    ).order_by('display_order', '-created_at')[:3]
-    
-    # Get top 2 featured gallery items for homepage
-    featured_gallery = GalleryItem.objects.filter(
-        is_active=True,
-        is_featured=True
-    ).order_by('display_order', '-created_at')[:2]
-    
-    # Get active contact information
-    contact_info = ContactInfo.objects.filter(is_active=True).first()
-    if not contact_info:
-        contact_info = ContactInfo.objects.first()
-    
-    context = {
-        'about_section': about_section,
-        'services': services,
-        'featured_projects': featured_projects,
-        'featured_gallery': featured_gallery,
-        'contact_info': contact_info,
-    }
-    return render(request, 'index.html', context)
-
-def gallery(request):
-    """Gallery page view - shows all active gallery images"""
-    all_gallery_items = GalleryItem.objects.filter(is_active=True).order_by('display_order', '-created_at')
-    
-    # Get active contact information
-    contact_info = ContactInfo.objects.filter(is_active=True).first()
-    if not contact_info:
-        contact_info = ContactInfo.objects.first()
-    
+    snapshot, context = await _page_content()
+    context.update({
+        'services': snapshot.services,
+        'featured_projects': snapshot.featured_projects,
+        'featured_gallery': snapshot.featured_gallery,
+    })
+    return await sync_to_async(render)(request, 'index.html', context)
+
+def _gallery_page(request, cursor):
+    """Return (items, next_cursor, category) for a gallery request"""
+    category = request.GET.get('category', '')
+    if category not in dict(GalleryItem.CATEGORY_CHOICES):
+        category = ''
+
+    active_items = GalleryItem.objects.filter(is_active=True)
+    if category:
+        active_items = active_items.filter(category=category)
+    items, next_cursor = keyset_page(active_items, cursor, GALLERY_PAGE_SIZE)
+    return items, next_cursor, category
+
+def _gallery_first_page(request):
+    """Gallery page for the requested cursor, falling back to the first page"""
+    try:
+        return _gallery_page(request, request.GET.get('after'))
+    except InvalidCursor:
+        return _gallery_page(request, None)
+
+def _gallery_first_page_in_thread(request):
+    """_gallery_first_page on a pool thread, closing that thread's connection afterwards"""
+    try:
+        return _gallery_first_page(request)
+    finally:
+        # Pool threads never see request_finished, so nothing else closes it
+        connections.close_all()
+
+async def _gallery_context(request):
+    """Load the gallery page context"""
+    (gallery_items, next_cursor, category), (snapshot, context) = await asyncio.gather(
+        sync_to_async(_gallery_first_page_in_thread, thread_sensitive=False)(request),
+        _page_content(),
+    )
+    context.update({
+        'gallery_items': gallery_items,
+        'next_cursor': next_cursor,
+        'active_category': category,
+        'gallery_facets': snapshot.gallery_facets,
+        'gallery_total': snapshot.gallery_total,
+    })
+    return context
+
+GALLERY_PAGE = StreamedPage(
+    'partials/gallery_head.html', 'gallery.html',
+    'gallery_items', 'partials/gallery_items.html', last_chunk_keys=('next_cursor',)
+)
+
+@conditional_public_page(GalleryItem, ContactInfo)
+@cache_public_page
+async def gallery(request):
+    """Gallery page view - shows the first page of active gallery images"""
+    if streaming_enabled():
+        return stream_page(request, GALLERY_PAGE, _gallery_context)
+    context = await _gallery_context(request)
+    return await sync_to_async(render)(request, 'gallery.html', context)
+
+@conditional_public_page(GalleryItem)
+@cache_public_page
+def gallery_items(request):
+    """Gallery fragment view - returns the next page of cards for infinite scroll"""
+    try:
+        items, next_cursor, category = _gallery_page(request, request.GET.get('after'))
+    except InvalidCursor:
+        return HttpResponseBadRequest('Invalid cursor')
+
     context = {
-        'gallery_items': all_gallery_items,
-        'contact_info': contact_info,
+        'gallery_items': items,
+        'next_cursor': next_cursor,
+        'active_category': category,
     }
-    return render(request, 'gallery.html', context)
+    return render(request, 'partials/gallery_items.html', context)
+
+async def _projects_context(request):
+    """Load the projects page context"""
+    snapshot, context = await _page_content()
+    context['projects'] = snapshot.projects
+    return context
 
-def projects(request):
+PROJECTS_PAGE = StreamedPage(
+    'partials/projects_head.html', 'projects.html',
+    'projects', 'partials/project_cards.html'
+)
+
+@conditional_public_page(Project, ContactInfo)
+@cache_public_page
+async def projects(request):
     """Projects page view - shows all active projects"""
-    all_projects = Project.objects.filter(is_active=True).order_by('display_order', '-created_at')
-    
-    # Get active contact information
-    contact_info = ContactInfo.objects.filter(is_active=True).first()
-    if not contact_info:
-        contact_info = ContactInfo.objects.first()
-    
-    context = {
-        'projects': all_projects,
-        'contact_info': contact_info,
-    }
-    return render(request, 'projects.html', context)
+    if streaming_enabled():
+        return stream_page(request, PROJECTS_PAGE, _projects_context)
+    context = await _projects_context(request)
+    return await sync_to_async(render)(request, 'projects.html', context)
+
+@conditional_public_page(Project)
+@cache_public_page
+def project_detail(request, slug):
+    """Project detail JSON - loaded by the project modal when it is opened"""
+    project = get_object_or_404(Project, slug=slug, is_active=True)
+    return JsonResponse({
+        'slug': project.slug,
+        'title': project.title,
+        'category': project.category,
+        'description': project.full_description,
+        'image': project.get_image_url(),
+        'client': project.client_name,
+        'date': project.completion_date,
+        'location': project.location,
+    })
+
+
+def service_worker(request):
+    """Generated service worker, served from memory with an ETag"""
+    worker = get_service_worker()
+    response = get_conditional_response(request, etag=worker.etag)
+    if response is None:
+        response = HttpResponse(worker.content, content_type='application/javascript')
+    response['ETag'] = worker.etag
+    # Browsers must check for a new worker on every navigation
+    patch_cache_control(response, no_cache=True)
+    # The worker fetches Cloudinary images for the image cache
+    response['Content-Security-Policy'] = "default-src 'self'; connect-src 'self' https:"
+    return response
+
+
+def remote_image(request, token):
+    """Resized local copy of an external project/gallery image (see remote_images.py)"""
+    return serve_remote_image(request, token)
+
+
+@never_cache
+def contact_token(request):
+    """Hand out a CSRF token for contact forms on pre-rendered pages"""
+    return JsonResponse({'token': get_token(request)})
 
 
 @require_POST
@@ -112,8 +215,8 @@ def contact_submit(request):
         return redirect('vmf_app:index')
 
 
-@require_POST  
-def contact_submit_ajax(request):
+@require_POST
+async def contact_submit_ajax(request):
     """Handle AJAX contact form submission"""
     try:
         # Parse JSON data
@@ -137,7 +240,7 @@ def contact_submit_ajax(request):
         user_agent = request.META.get('HTTP_USER_AGENT', '')
         
         # Create contact submission
-        contact_submission = ContactSubmission.objects.create(
+        contact_submission = await ContactSubmission.objects.acreate(
             name=name,
             email=email,
             subject=subject,
@@ -46,6 +46,7 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "vmf_app.middleware.SecurityHeadersMiddleware",
     "vmf_app.middleware.AdminSecurityMiddleware",
+    "vmf_app.middleware.MediaFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -68,6 +69,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "django.template.context_processors.media",
+                "vmf_app.context_processors.site_content",
             ],
         },
     },
@@ -83,6 +85,13 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # The job worker writes alongside the web workers: WAL lets reads run
+        # during a write, IMMEDIATE transactions wait for the lock up front
+        "OPTIONS": {
+            "timeout": 20,
+            "transaction_mode": "IMMEDIATE",
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+        },
     }
 }
 
@@ -127,17 +136,95 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Generated assets (critical CSS, purged stylesheet, JS bundles), served as static/build/...
+# Rebuilt by `manage.py build_critical_css` and `build_js_bundles` before collectstatic
+VMF_ASSET_BUILD_DIR = BASE_DIR / "static" / "build"
+
 # WhiteNoise configuration for static files serving
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# The manifest storage writes staticfiles.json, which the service worker precaches from
+# Uploads are stored once per unique content under media/cas/ (see vmf_app/storage.py)
+STORAGES = {
+    "default": {
+        "BACKEND": "vmf_app.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 # Media files (User uploaded content)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-# WhiteNoise configuration for serving media files in production
+# Uploaded media is served by vmf_app.middleware.MediaFilesMiddleware
+# Behind nginx, VMF_MEDIA_SENDFILE=x-accel-redirect hands the transfer to an
+# internal location aliased to MEDIA_ROOT (x-sendfile for Apache/lighttpd)
+VMF_MEDIA_SENDFILE = os.environ.get('VMF_MEDIA_SENDFILE', '').lower()
+VMF_MEDIA_ACCEL_PREFIX = os.environ.get('VMF_MEDIA_ACCEL_PREFIX', '/protected-media/')
+VMF_MEDIA_MAX_AGE = int(os.environ.get('VMF_MEDIA_MAX_AGE', '86400'))
+
+# Ask Cloudinary for resized AVIF/WebP (f_auto,q_auto,w_<n>) instead of the
+# uploaded originals; external images get a srcset from it
+VMF_CLOUDINARY_TRANSFORMS = os.environ.get('VMF_CLOUDINARY_TRANSFORMS', 'True').lower() == 'true'
+
+# Serve external (Cloudinary) project/gallery images through /remote-image/:
+# fetched once, resized and cached under MEDIA_ROOT/remote/
+VMF_IMAGE_PROXY = os.environ.get('VMF_IMAGE_PROXY', 'False').lower() == 'true'
+VMF_IMAGE_PROXY_HOSTS = [host.strip() for host in os.environ.get('VMF_IMAGE_PROXY_HOSTS', 'res.cloudinary.com').split(',') if host.strip()]
+VMF_IMAGE_PROXY_TIMEOUT = int(os.environ.get('VMF_IMAGE_PROXY_TIMEOUT', '10'))
+# Seconds a source that failed is not fetched again (requests go straight to it)
+VMF_IMAGE_PROXY_RETRY_AFTER = int(os.environ.get('VMF_IMAGE_PROXY_RETRY_AFTER', '60'))
+
+# WhiteNoise configuration for serving static files
 WHITENOISE_USE_FINDERS = True
 WHITENOISE_AUTOREFRESH = True
 
+# Pre-rendered public pages (written by `manage.py prerender_site`)
+# When enabled, WhiteNoise serves them before Django sees the request
+VMF_PRERENDER_ROOT = BASE_DIR / 'prerendered'
+if os.environ.get('VMF_SERVE_PRERENDERED', 'False').lower() == 'true':
+    WHITENOISE_ROOT = VMF_PRERENDER_ROOT
+    WHITENOISE_INDEX_FILE = True
+
+# Cache configuration
+# File-based so every gunicorn worker sees the same pages and content version
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get('DJANGO_CACHE_DIR', str(BASE_DIR / 'cache')),
+    }
+}
+
+# Seconds a rendered public page is kept (pages are also dropped on content changes)
+VMF_PAGE_CACHE_TIMEOUT = int(os.environ.get('VMF_PAGE_CACHE_TIMEOUT', '86400'))
+
+# Gallery cards per page (the gallery loads further pages on scroll)
+VMF_GALLERY_PAGE_SIZE = int(os.environ.get('VMF_GALLERY_PAGE_SIZE', '24'))
+
+# Stream the gallery and projects pages: the head is flushed first and the
+# item grid follows in chunks (only uncached renders stream)
+VMF_STREAM_PAGES = os.environ.get('VMF_STREAM_PAGES', 'False').lower() == 'true'
+VMF_STREAM_CHUNK_SIZE = int(os.environ.get('VMF_STREAM_CHUNK_SIZE', '12'))
+
+# Images the service worker keeps for stale-while-revalidate
+VMF_SW_IMAGE_CACHE_LIMIT = int(os.environ.get('VMF_SW_IMAGE_CACHE_LIMIT', '120'))
+
+# Responsive derivatives generated for uploaded project/gallery images
+# (formats this Pillow build cannot encode are skipped)
+VMF_IMAGE_WIDTHS = (480, 800, 1200, 1600)
+VMF_IMAGE_FORMATS = ('avif', 'webp')
+# Gallery card thumbnails (cropped to the card's aspect ratio)
+VMF_THUMBNAIL_SIZE = (960, 560)
+
+# Background jobs (`manage.py run_jobs`): queue name -> jobs running at once
+# Inline mode runs jobs after the commit in the request. It is the default, so
+# deployments without a worker (runserver, Render's web service) still process
+# uploads; start_production.sh starts a worker and turns it off
+VMF_JOB_QUEUES = {'default': 2, 'images': 1}
+VMF_JOB_RETRY_DELAY = int(os.environ.get('VMF_JOB_RETRY_DELAY', '30'))
+VMF_JOB_TIMEOUT = int(os.environ.get('VMF_JOB_TIMEOUT', '600'))
+VMF_RUN_JOBS_INLINE = os.environ.get('VMF_RUN_JOBS_INLINE', 'True').lower() == 'true'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -19,21 +19,16 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import HttpResponse
 from django.views.generic import TemplateView
 
-# Service worker view
-def service_worker_view(request):
-    with open(settings.BASE_DIR / 'static' / 'sw.js', 'r') as f:
-        content = f.read()
-    return HttpResponse(content, content_type='application/javascript')
+from vmf_app.views import service_worker
 
 # Get admin URL from settings (for security)
 admin_url = getattr(settings, 'ADMIN_URL', 'admin/')
 
 urlpatterns = [
     path(admin_url, admin.site.urls),
-    path('sw.js', service_worker_view, name='service_worker'),
+    path('sw.js', service_worker, name='service_worker'),
     path("", include("vmf_app.urls")),
 ]
 
@@ -41,5 +36,4 @@ urlpatterns = [
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
-# Serve media files in both development and production
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media files are served by vmf_app.middleware.MediaFilesMiddleware